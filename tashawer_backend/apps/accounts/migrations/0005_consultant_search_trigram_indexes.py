@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:43
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from apps.core.migrations_ops import AddPostgresIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_add_consultant_discovery_models'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddPostgresIndex(
+            model_name='consultantprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['full_name'], name='cp_full_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        AddPostgresIndex(
+            model_name='consultantprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['full_name_ar'], name='cp_full_name_ar_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        AddPostgresIndex(
+            model_name='consultantprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['specialization'], name='cp_specialization_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_consultant_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='consultantprofile',
+            index=models.Index(fields=['-rating', 'id'], name='cp_rating_id_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_consultant_rating_keyset_index'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='consultantprofile',
+            index=models.Index(fields=['-experience_years'], name='cp_experience_years_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='consultantprofile',
+            index=models.Index(fields=['-hourly_rate'], name='cp_hourly_rate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='consultantprofile',
+            index=models.Index(fields=['-total_projects_completed'], name='cp_projects_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('account_status', 'active'), ('is_approved', True), ('is_verified', True)), fields=['role'], name='u_active_consultant'),
+        ),
+    ]
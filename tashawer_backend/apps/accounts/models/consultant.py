@@ -9,7 +9,7 @@ from apps.core.models import BaseModel, SoftDeleteModel
 
 def portfolio_image_path(instance, filename):
     """Generate upload path for portfolio images"""
-    return f'consultants/{instance.consultant.user.id}/portfolio/{filename}'
+    return f'consultants/{instance.portfolio.consultant.user_id}/portfolio/{filename}'
 
 
 class ConsultantPortfolio(SoftDeleteModel):
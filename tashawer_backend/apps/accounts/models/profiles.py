@@ -1,6 +1,7 @@
 """
 Profile models for different user types.
 """
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
 from apps.core.models import BaseModel
@@ -355,6 +356,18 @@ class ConsultantProfile(BaseModel):
     class Meta:
         verbose_name = 'Consultant Profile'
         verbose_name_plural = 'Consultant Profiles'
+        indexes = [
+            # Trigram indexes backing consultant search (PostgreSQL only)
+            GinIndex(fields=['full_name'], name='cp_full_name_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['full_name_ar'], name='cp_full_name_ar_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['specialization'], name='cp_specialization_trgm', opclasses=['gin_trgm_ops']),
+            # Keyset pagination on the default listing order
+            models.Index(fields=['-rating', 'id'], name='cp_rating_id_idx'),
+            # Alternative consultant listing orders
+            models.Index(fields=['-experience_years'], name='cp_experience_years_idx'),
+            models.Index(fields=['-hourly_rate'], name='cp_hourly_rate_idx'),
+            models.Index(fields=['-total_projects_completed'], name='cp_projects_completed_idx'),
+        ]
 
     def __str__(self):
         return f"{self.full_name} ({self.user.email})"
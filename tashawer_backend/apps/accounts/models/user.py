@@ -196,6 +196,18 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         ordering = ['-created_at']
+        indexes = [
+            # Publicly listed consultants (ConsultantListView base filter)
+            models.Index(
+                fields=['role'],
+                condition=models.Q(
+                    is_verified=True,
+                    is_approved=True,
+                    account_status='active'
+                ),
+                name='u_active_consultant'
+            ),
+        ]
 
     def __str__(self):
         return self.email
@@ -237,7 +237,8 @@ class ConsultantListSerializer(serializers.ModelSerializer):
         ]
 
     def get_skills_count(self, obj):
-        return obj.skill_items.count()
+        # len() over the prefetched skill_items avoids a COUNT per consultant
+        return len(obj.skill_items.all())
 
     def get_top_skills(self, obj):
         skills = obj.skill_items.all()[:5]
@@ -284,12 +285,14 @@ class ProjectInvitationSerializer(serializers.ModelSerializer):
 
 
 class ProjectInvitationCreateSerializer(serializers.ModelSerializer):
-    """Serializer for creating project invitations."""
+    """
+    Serializer for creating project invitations.
+    The project comes from the URL, passed as `project_id` in the context.
+    """
 
     class Meta:
         model = ProjectInvitation
         fields = [
-            'project',
             'consultant',
             'message',
             'expires_at',
@@ -309,6 +312,15 @@ class ProjectInvitationCreateSerializer(serializers.ModelSerializer):
         return value
 
     def validate(self, data):
+        try:
+            project = Project.objects.get(pk=self.context['project_id'])
+        except Project.DoesNotExist:
+            raise serializers.ValidationError({'project': "Project not found."})
+        try:
+            data['project'] = self.validate_project(project)
+        except serializers.ValidationError as e:
+            raise serializers.ValidationError({'project': e.detail})
+
         # Check if invitation already exists
         if ProjectInvitation.objects.filter(
             project=data['project'],
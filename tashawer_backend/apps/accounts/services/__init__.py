@@ -1,3 +1,6 @@
 from apps.accounts.services.email_service import EmailService
+from apps.accounts.services.dashboard_cache import ConsultantDashboardCache
+from apps.accounts.services.directory_cache import ConsultantDirectoryVersion
+from apps.accounts.services.avatar_service import AvatarService
 
-__all__ = ['EmailService']
+__all__ = ['EmailService', 'ConsultantDashboardCache', 'ConsultantDirectoryVersion', 'AvatarService']
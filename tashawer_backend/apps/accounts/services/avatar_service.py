@@ -0,0 +1,103 @@
+"""
+Avatar service for generating and locating avatar thumbnails.
+"""
+import hashlib
+import io
+import logging
+import os
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+class AvatarService:
+    """Service for avatar/logo thumbnail renditions."""
+
+    # Square bounding boxes (px) covering 1x/2x of the rendered avatar sizes
+    THUMBNAIL_SIZES = (40, 80, 128, 256)
+    THUMBNAIL_FORMAT = 'webp'
+
+    @staticmethod
+    def get_hashed_name(file, user_id):
+        """
+        Content-addressed name for an uploaded avatar: {user_id}_{sha256[:32]}{ext}
+        (128 bits of the hash keeps the stored name within the field's 100 chars).
+        A user re-uploading an image reuses the stored object, and a new
+        image always gets a new URL, so it can be cached as immutable.
+        Objects are never shared between users, so deleting one user's
+        avatar can't remove a file another profile has just switched to.
+        """
+        digest = hashlib.sha256()
+        for chunk in file.chunks():
+            digest.update(chunk)
+        file.seek(0)
+        ext = os.path.splitext(file.name)[1].lower()
+        return f'{user_id}_{digest.hexdigest()[:32]}{ext}'
+
+    @staticmethod
+    def is_referenced(name):
+        """Whether any profile still uses the stored avatar/logo `name`."""
+        from apps.accounts.models import (
+            ConsultantProfile,
+            IndividualProfile,
+            OrganizationProfile,
+        )
+
+        return (
+            ConsultantProfile.objects.filter(avatar=name).exists()
+            or IndividualProfile.objects.filter(avatar=name).exists()
+            or OrganizationProfile.objects.filter(logo=name).exists()
+        )
+
+    @staticmethod
+    def get_thumbnail_name(name, size):
+        """
+        Storage name of a thumbnail for the avatar stored at `name`.
+        e.g. avatars/consultants/me.png -> avatars/consultants/thumbnails/me_80.webp
+        """
+        directory, filename = os.path.split(name)
+        stem = os.path.splitext(filename)[0]
+        return f'{directory}/thumbnails/{stem}_{size}.{AvatarService.THUMBNAIL_FORMAT}'
+
+    @classmethod
+    def get_thumbnail_urls(cls, name, request=None):
+        """Map each thumbnail size to its URL (absolute when a request is given)."""
+        urls = {}
+        for size in cls.THUMBNAIL_SIZES:
+            url = default_storage.url(cls.get_thumbnail_name(name, size))
+            urls[str(size)] = request.build_absolute_uri(url) if request else url
+        return urls
+
+    @classmethod
+    def generate_thumbnails(cls, name):
+        """Render every thumbnail size of the avatar stored at `name` as WebP."""
+        with default_storage.open(name, 'rb') as source:
+            image = Image.open(source)
+            image.load()
+
+        # Keep transparency (e.g. organization logos), drop palettes/CMYK
+        has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        for size in cls.THUMBNAIL_SIZES:
+            thumbnail = image.copy()
+            thumbnail.thumbnail((size, size), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            thumbnail.save(buffer, format='WEBP', quality=82, method=6)
+
+            thumbnail_name = cls.get_thumbnail_name(name, size)
+            if default_storage.exists(thumbnail_name):
+                default_storage.delete(thumbnail_name)
+            default_storage.save(thumbnail_name, ContentFile(buffer.getvalue()))
+
+    @classmethod
+    def delete_thumbnails(cls, name):
+        """Remove the thumbnails of the avatar stored at `name`."""
+        for size in cls.THUMBNAIL_SIZES:
+            try:
+                default_storage.delete(cls.get_thumbnail_name(name, size))
+            except Exception as e:
+                logger.warning(f"Failed to delete avatar thumbnail: {e}")
@@ -0,0 +1,24 @@
+"""
+Cache for the consultant dashboard response.
+"""
+from django.core.cache import cache
+
+
+class ConsultantDashboardCache:
+    """Short-lived per-user cache of the consultant dashboard payload."""
+
+    TIMEOUT = 60  # seconds
+
+    @staticmethod
+    def get_key(user_id):
+        return f'consultant:dashboard:{user_id}'
+
+    @classmethod
+    def get_or_set(cls, user_id, default):
+        """Return the cached payload, building it with `default()` on a miss."""
+        return cache.get_or_set(cls.get_key(user_id), default, timeout=cls.TIMEOUT)
+
+    @classmethod
+    def invalidate(cls, user_id):
+        """Drop the cached payload for a user."""
+        cache.delete(cls.get_key(user_id))
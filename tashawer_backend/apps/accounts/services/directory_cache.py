@@ -0,0 +1,53 @@
+"""
+Version tokens for the public consultant listing and profiles.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+class ConsultantDirectoryVersion:
+    """
+    Cache-held version tokens for the public consultant pages, used as
+    their ETags. Signals bump them when the underlying rows change, so a
+    conditional GET is answered without querying the database.
+    """
+
+    LIST_KEY = 'consultant:list:version'
+
+    @staticmethod
+    def get_profile_key(user_id):
+        return f'consultant:profile:{user_id}:version'
+
+    @staticmethod
+    def _get(key):
+        version = cache.get(key)
+        if version is None:
+            # Start a new version if it was never set or has been evicted
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            version = cache.get(key)
+        return version
+
+    @staticmethod
+    def _bump(key):
+        # After commit, so a request can't pair the new version with old rows
+        transaction.on_commit(lambda: cache.set(key, uuid.uuid4().hex, timeout=None))
+
+    @classmethod
+    def get_list_version(cls):
+        return cls._get(cls.LIST_KEY)
+
+    @classmethod
+    def get_profile_version(cls, user_id):
+        return cls._get(cls.get_profile_key(user_id))
+
+    @classmethod
+    def bump_list(cls):
+        """Mark the consultant listing as changed."""
+        cls._bump(cls.LIST_KEY)
+
+    @classmethod
+    def bump_profile(cls, user_id):
+        """Mark a consultant's public profile as changed."""
+        cls._bump(cls.get_profile_key(user_id))
@@ -3,11 +3,22 @@ Signals for accounts app.
 """
 import logging
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from apps.accounts.models import User
+from apps.accounts.models import (
+    User,
+    ConsultantProfile,
+    ConsultantPortfolio,
+    PortfolioImage,
+    ConsultantSkill,
+    ConsultantCertification,
+    ProjectInvitation,
+)
+from apps.accounts.services.dashboard_cache import ConsultantDashboardCache
+from apps.accounts.services.directory_cache import ConsultantDirectoryVersion
 from apps.accounts.services.email_service import EmailService
+from apps.proposals.models import Proposal
 
 logger = logging.getLogger(__name__)
 
@@ -28,3 +39,53 @@ def user_post_save(sender, instance, created, update_fields, **kwargs):
                 EmailService.send_account_approved_email(instance)
             except Exception as e:
                 logger.error(f"Failed to send account approved email: {str(e)}")
+
+
+@receiver(post_save, sender=User)
+def consultant_user_changed(sender, instance, update_fields, **kwargs):
+    """Bump the public consultant pages when a consultant's account changes."""
+    if instance.role != 'consultant':
+        return
+    # Logins only touch last_login, which the public pages don't show
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    ConsultantDirectoryVersion.bump_list()
+    ConsultantDirectoryVersion.bump_profile(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=ConsultantProfile)
+def consultant_profile_changed(sender, instance, **kwargs):
+    """Invalidate the consultant dashboard and public pages when the profile changes."""
+    ConsultantDashboardCache.invalidate(instance.user_id)
+    ConsultantDirectoryVersion.bump_list()
+    ConsultantDirectoryVersion.bump_profile(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=ConsultantPortfolio)
+@receiver([post_save, post_delete], sender=ConsultantSkill)
+@receiver([post_save, post_delete], sender=ConsultantCertification)
+def consultant_item_changed(sender, instance, **kwargs):
+    """Invalidate the consultant dashboard and public profile when a counted item changes."""
+    user_id = instance.consultant.user_id
+    ConsultantDashboardCache.invalidate(user_id)
+    ConsultantDirectoryVersion.bump_profile(user_id)
+    if sender is ConsultantSkill:
+        # Skills are also listed on the consultant listing
+        ConsultantDirectoryVersion.bump_list()
+
+
+@receiver([post_save, post_delete], sender=PortfolioImage)
+def portfolio_image_changed(sender, instance, **kwargs):
+    """Bump the public profile when a portfolio image changes."""
+    user_id = ConsultantPortfolio.objects.filter(
+        pk=instance.portfolio_id
+    ).values_list('consultant__user_id', flat=True).first()
+    if user_id:
+        ConsultantDirectoryVersion.bump_profile(user_id)
+
+
+@receiver([post_save, post_delete], sender=ProjectInvitation)
+@receiver([post_save, post_delete], sender=Proposal)
+def consultant_activity_changed(sender, instance, **kwargs):
+    """Invalidate the consultant dashboard when invitations or proposals change."""
+    ConsultantDashboardCache.invalidate(instance.consultant_id)
@@ -0,0 +1,87 @@
+"""
+Celery tasks for accounts app.
+"""
+import logging
+import os
+
+from celery import shared_task
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from apps.accounts.models import ConsultantPortfolio, PortfolioImage, User
+from apps.accounts.services import AvatarService, EmailService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def process_portfolio_image(image_id, portfolio_id, tmp_key, caption='', is_primary=False):
+    """
+    Persist an uploaded portfolio image from temporary storage.
+    Creates the PortfolioImage row (using the id returned to the client)
+    and moves the file to its final upload path. `is_primary` is only
+    honoured while the portfolio has no primary image yet.
+    """
+    try:
+        with default_storage.open(tmp_key, 'rb') as tmp_file:
+            portfolio_image = PortfolioImage(
+                id=image_id,
+                portfolio_id=portfolio_id,
+                caption=caption,
+            )
+            # Strip the uuid prefix added when the upload was stashed
+            filename = os.path.basename(tmp_key).split('_', 1)[-1]
+            portfolio_image.image.save(filename, File(tmp_file), save=False)
+
+        with transaction.atomic():
+            # Lock the portfolio so concurrent uploads settle a single primary
+            ConsultantPortfolio.objects.select_for_update().get(pk=portfolio_id)
+            portfolio_image.is_primary = is_primary and not PortfolioImage.objects.filter(
+                portfolio_id=portfolio_id, is_primary=True
+            ).exists()
+            portfolio_image.save()
+    except Exception as e:
+        logger.error(f"Failed to process portfolio image {image_id}: {str(e)}")
+        raise
+    finally:
+        default_storage.delete(tmp_key)
+
+
+@shared_task
+def generate_avatar_thumbnails(name):
+    """
+    Generate WebP thumbnails for an uploaded avatar/logo.
+    Runs after upload so the request does not wait on image processing.
+    """
+    try:
+        AvatarService.generate_thumbnails(name)
+    except Exception as e:
+        logger.error(f"Failed to generate thumbnails for {name}: {str(e)}")
+        raise
+
+
+@shared_task(autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+def delete_avatar_files(name):
+    """
+    Delete a replaced or removed avatar/logo and its thumbnails from storage.
+    Keeps remote storage round-trips out of the request.
+    A file the user has switched back to in the meantime is kept.
+    """
+    if AvatarService.is_referenced(name):
+        return
+    AvatarService.delete_thumbnails(name)
+    default_storage.delete(name)
+
+
+@shared_task(autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+def send_verification_email(user_id):
+    """
+    Send the email verification link outside the request cycle.
+    SMTP failures are retried with backoff instead of failing the request.
+    """
+    try:
+        user = User.objects.get(pk=user_id, is_verified=False)
+    except User.DoesNotExist:
+        return
+    EmailService.send_verification_email(user)
@@ -0,0 +1,141 @@
+import uuid
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import ConsultantPortfolio, ConsultantProfile, User
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+CONSULTANT_LIST_URL = '/api/v1/consultants/'
+
+
+def create_consultant(index, rating):
+    """Create a verified, approved consultant visible in public browsing."""
+    user = User.objects.create_user(
+        f'consultant{index}@example.com',
+        'pass12345678',
+        role='consultant',
+        is_verified=True,
+        is_approved=True,
+        account_status='active',
+    )
+    return ConsultantProfile.objects.create(
+        user=user,
+        full_name=f'Consultant {index}',
+        specialization='Civil Engineering',
+        rating=Decimal(rating),
+    )
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ConsultantListCursorTests(TestCase):
+    """Keyset pagination of the consultant listing (?after=<rating>,<id>)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Repeated ratings exercise the id tiebreak
+        cls.profiles = [create_consultant(i, i % 3) for i in range(7)]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_cursor_pages_through_every_consultant_once(self):
+        seen = []
+        params = {'page_size': 3}
+        while True:
+            response = self.client.get(CONSULTANT_LIST_URL, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = response.json()
+            seen += [consultant['id'] for consultant in data['consultants']]
+            cursor = data['pagination']['next_cursor']
+            if not cursor:
+                break
+            params['after'] = cursor
+
+        self.assertEqual(len(seen), len(self.profiles))
+        self.assertEqual(set(seen), {str(profile.id) for profile in self.profiles})
+
+    def test_cursor_page_matches_offset_page(self):
+        first = self.client.get(CONSULTANT_LIST_URL, {'page_size': 3}).json()
+        by_cursor = self.client.get(CONSULTANT_LIST_URL, {
+            'page_size': 3, 'after': first['pagination']['next_cursor'],
+        }).json()
+        by_offset = self.client.get(CONSULTANT_LIST_URL, {'page_size': 3, 'page': 2}).json()
+
+        self.assertEqual(
+            [consultant['id'] for consultant in by_cursor['consultants']],
+            [consultant['id'] for consultant in by_offset['consultants']],
+        )
+
+    def test_non_finite_cursor_is_rejected(self):
+        for rating in ('NaN', 'sNaN', 'Infinity', '-Infinity'):
+            with self.subTest(rating=rating):
+                response = self.client.get(CONSULTANT_LIST_URL, {'after': f'{rating},{uuid.uuid4()}'})
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_malformed_cursor_is_rejected(self):
+        for cursor in ('bad', '4.5', f'abc,{uuid.uuid4()}', '4.5,not-a-uuid', ','):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(CONSULTANT_LIST_URL, {'after': cursor})
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ConsultantETagTests(TestCase):
+    """Conditional GETs of the public consultant listing and profile."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.profile = create_consultant(1, 4)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.profile_url = f'{CONSULTANT_LIST_URL}{self.profile.user_id}/'
+
+    def test_list_not_modified_without_queries(self):
+        etag = self.client.get(CONSULTANT_LIST_URL, {'page_size': 5})['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(CONSULTANT_LIST_URL, {'page_size': 5}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_etag_depends_on_query_params(self):
+        etag = self.client.get(CONSULTANT_LIST_URL, {'page_size': 5})['ETag']
+
+        response = self.client.get(CONSULTANT_LIST_URL, {'page_size': 6}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_changes_with_profile(self):
+        etag = self.client.get(CONSULTANT_LIST_URL)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.full_name = 'Renamed Consultant'
+            self.profile.save()
+
+        response = self.client.get(CONSULTANT_LIST_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_profile_not_modified_without_queries(self):
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.profile_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_profile_etag_changes_with_portfolio(self):
+        etag = self.client.get(self.profile_url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ConsultantPortfolio.objects.create(
+                consultant=self.profile, title='Bridge', description='Design review',
+            )
+
+        response = self.client.get(self.profile_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -18,6 +18,7 @@ from apps.accounts.serializers.auth import (
     ResetPasswordSerializer,
 )
 from apps.accounts.services.email_service import EmailService
+from apps.accounts.tasks import send_verification_email
 
 
 class UserTypesView(APIView):
@@ -247,7 +248,7 @@ class ResendVerificationView(APIView):
 
         try:
             user = User.objects.get(email=email, is_verified=False)
-            EmailService.send_verification_email(user)
+            send_verification_email.delay(str(user.id))
         except User.DoesNotExist:
             pass  # Don't reveal if email exists
 
@@ -1,13 +1,28 @@
 """
 Views for consultant discovery and portfolio management.
 """
-from django.db.models import Q
+import hashlib
+import uuid
+from decimal import Decimal
+from functools import partial
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import Count, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser
 
+from apps.core.exceptions import PermissionDeniedError
+from apps.core.permissions import IsConsultant
 from apps.accounts.models import (
     User,
     ConsultantProfile,
@@ -20,7 +35,6 @@ from apps.accounts.models import (
 from apps.accounts.serializers import (
     ConsultantPortfolioSerializer,
     ConsultantPortfolioCreateSerializer,
-    PortfolioImageSerializer,
     ConsultantSkillSerializer,
     ConsultantSkillCreateSerializer,
     ConsultantCertificationSerializer,
@@ -31,6 +45,95 @@ from apps.accounts.serializers import (
     ProjectInvitationCreateSerializer,
     AvailabilityStatusSerializer,
 )
+from apps.accounts.services import ConsultantDashboardCache, ConsultantDirectoryVersion
+from apps.accounts.tasks import process_portfolio_image
+from apps.proposals.models import Proposal
+
+
+# Consultants visible in public browsing and profile pages
+PUBLIC_CONSULTANT_FILTERS = {
+    'user__is_verified': True,
+    'user__is_approved': True,
+    'user__account_status': 'active',
+    'user__role': 'consultant',
+}
+
+
+def _count_subquery(queryset, field, outer_ref):
+    """Correlated COUNT(*) of `queryset` rows whose `field` matches `outer_ref`."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: outer_ref})
+            .order_by()
+            .values(field)
+            .annotate(count=Count('pk'))
+            .values('count')
+        ),
+        0
+    )
+
+
+def _consultant_list_etag(request):
+    """
+    ETag for the consultant listing: the listing version (bumped by signals
+    when a consultant or their skills change) plus the query parameters.
+    """
+    key = f"{request.META.get('QUERY_STRING', '')}|{ConsultantDirectoryVersion.get_list_version()}"
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def _public_profile_etag(request, user_id):
+    """
+    ETag for a public consultant profile: its version, bumped by signals
+    when the profile or any of its portfolio items, images, skills or
+    certifications change.
+    """
+    key = f"{user_id}|{ConsultantDirectoryVersion.get_profile_version(user_id)}"
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+# Orderings accepted by ConsultantListView
+CONSULTANT_LIST_ORDERINGS = frozenset({
+    'rating', '-rating',
+    'experience_years', '-experience_years',
+    'total_projects_completed', '-total_projects_completed',
+    'hourly_rate', '-hourly_rate',
+})
+
+# ConsultantListView query parameters: text, integer and decimal (with defaults)
+_LIST_TEXT_PARAMS = ('search', 'city', 'availability', 'skill', 'category', 'ordering', 'after')
+_LIST_INT_PARAMS = {'page': 1, 'page_size': 20, 'min_experience': None}
+_LIST_FLOAT_PARAMS = {'min_rating': None}
+
+
+def _parse_consultant_list_params(query_params):
+    """
+    Read every ConsultantListView query parameter in one pass.
+    Missing or malformed numbers fall back to their defaults.
+    """
+    params = {name: query_params.get(name, '') for name in _LIST_TEXT_PARAMS}
+    for names, cast in ((_LIST_INT_PARAMS, int), (_LIST_FLOAT_PARAMS, float)):
+        for name, default in names.items():
+            try:
+                params[name] = cast(query_params[name])
+            except (KeyError, ValueError):
+                params[name] = default
+    return params
+
+
+class ConsultantProfileMixin:
+    """
+    Restrict a view to consultants and resolve the requesting consultant's
+    profile once, exposing it as `request.consultant_profile`.
+    """
+    permission_classes = [IsAuthenticated, IsConsultant]
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        try:
+            request.consultant_profile = request.user.consultant_profile
+        except ConsultantProfile.DoesNotExist:
+            raise PermissionDeniedError('Consultant profile not found.')
 
 
 class ConsultantListView(APIView):
@@ -40,81 +143,145 @@ class ConsultantListView(APIView):
     """
     permission_classes = [AllowAny]
 
+    # Minimum pg_trgm similarity for a consultant to match a search term
+    SEARCH_SIMILARITY_THRESHOLD = 0.1
+
+    @method_decorator(cache_control(public=True, max_age=30, stale_while_revalidate=60))
+    @method_decorator(condition(etag_func=_consultant_list_etag))
     def get(self, request):
         queryset = ConsultantProfile.objects.filter(
-            user__is_verified=True,
-            user__is_approved=True,
-            user__account_status='active',
-            user__role='consultant'
-        ).select_related('user')
+            **PUBLIC_CONSULTANT_FILTERS
+        ).select_related('user').only(
+            # Columns rendered by ConsultantListSerializer
+            'id',
+            'user__id',
+            'consultant_type',
+            'full_name',
+            'specialization',
+            'experience_years',
+            'hourly_rate',
+            'avatar',
+            'bio',
+            'city',
+            'availability_status',
+            'rating',
+            'total_reviews',
+            'total_projects_completed',
+        ).prefetch_related(
+            # skills_count / top_skills for the whole page in one query
+            Prefetch('skill_items', queryset=ConsultantSkill.objects.only('id', 'consultant_id', 'name'))
+        )
+
+        params = _parse_consultant_list_params(request.query_params)
 
         # Search by name or specialization
-        search = request.query_params.get('search', '')
+        search = params['search']
+        ranked_by_similarity = False
         if search:
-            queryset = queryset.filter(
-                Q(full_name__icontains=search) |
-                Q(full_name_ar__icontains=search) |
-                Q(specialization__icontains=search)
-            )
+            if connection.vendor == 'postgresql':
+                # The % operator (trigram_similar) can use the pg_trgm GIN
+                # indexes on ConsultantProfile; its cutoff is set_limit().
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT set_limit(%s)', [self.SEARCH_SIMILARITY_THRESHOLD])
+                queryset = queryset.filter(
+                    Q(full_name__trigram_similar=search) |
+                    Q(full_name_ar__trigram_similar=search) |
+                    Q(specialization__trigram_similar=search)
+                ).annotate(
+                    # Only used to rank the matches
+                    similarity=Greatest(
+                        TrigramSimilarity('full_name', search),
+                        TrigramSimilarity('full_name_ar', search),
+                        TrigramSimilarity('specialization', search),
+                    )
+                )
+                ranked_by_similarity = True
+            else:
+                queryset = queryset.filter(
+                    Q(full_name__icontains=search) |
+                    Q(full_name_ar__icontains=search) |
+                    Q(specialization__icontains=search)
+                )
 
         # Filter by city
-        city = request.query_params.get('city', '')
+        city = params['city']
         if city:
             queryset = queryset.filter(city__icontains=city)
 
         # Filter by availability
-        availability = request.query_params.get('availability', '')
+        availability = params['availability']
         if availability:
             queryset = queryset.filter(availability_status=availability)
 
         # Filter by skill
-        skill = request.query_params.get('skill', '')
+        skill = params['skill']
         if skill:
             queryset = queryset.filter(
                 skill_items__name__icontains=skill
             ).distinct()
 
         # Filter by category
-        category = request.query_params.get('category', '')
+        category = params['category']
         if category:
             queryset = queryset.filter(
                 skill_items__category_id=category
             ).distinct()
 
         # Filter by minimum rating
-        min_rating = request.query_params.get('min_rating', '')
-        if min_rating:
-            try:
-                queryset = queryset.filter(rating__gte=float(min_rating))
-            except ValueError:
-                pass
+        if params['min_rating'] is not None:
+            queryset = queryset.filter(rating__gte=params['min_rating'])
 
         # Filter by experience years
-        min_experience = request.query_params.get('min_experience', '')
-        if min_experience:
-            try:
-                queryset = queryset.filter(experience_years__gte=int(min_experience))
-            except ValueError:
-                pass
-
-        # Ordering
-        ordering = request.query_params.get('ordering', '-rating')
-        valid_orderings = ['rating', '-rating', 'experience_years', '-experience_years',
-                          'total_projects_completed', '-total_projects_completed',
-                          'hourly_rate', '-hourly_rate']
-        if ordering in valid_orderings:
+        if params['min_experience'] is not None:
+            queryset = queryset.filter(experience_years__gte=params['min_experience'])
+
+        # Ordering (search results default to best match first)
+        ordering = params['ordering']
+        # The default rating order gets an id tiebreak so it can be keyset-paginated
+        keyset_ordering = ordering == '-rating' or (
+            ordering not in CONSULTANT_LIST_ORDERINGS and not ranked_by_similarity
+        )
+        if keyset_ordering:
+            queryset = queryset.order_by('-rating', 'id')
+        elif ordering in CONSULTANT_LIST_ORDERINGS:
             queryset = queryset.order_by(ordering)
+        else:
+            queryset = queryset.order_by('-similarity', '-rating')
 
         # Pagination
-        page = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('page_size', 20))
-        page_size = min(page_size, 50)  # Max 50 per page
-
-        start = (page - 1) * page_size
-        end = start + page_size
+        page = max(params['page'], 1)
+        page_size = min(max(params['page_size'], 1), 50)  # Max 50 per page
 
         total_count = queryset.count()
-        consultants = queryset[start:end]
+
+        # Keyset pagination: ?after=<rating>,<id> seeks past the previous page
+        # instead of scanning and discarding OFFSET rows on deep pages.
+        after = params['after']
+        if after and keyset_ordering:
+            try:
+                after_rating, after_id = after.split(',', 1)
+                after_rating = Decimal(after_rating)
+                if not after_rating.is_finite():
+                    raise ValueError('Non-finite cursor rating')
+                after_id = uuid.UUID(after_id)
+            except (ValueError, ArithmeticError):
+                return Response(
+                    {'error': 'Invalid cursor'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            consultants = list(queryset.filter(
+                Q(rating__lt=after_rating) |
+                Q(rating=after_rating, id__gt=after_id)
+            )[:page_size])
+        else:
+            start = (page - 1) * page_size
+            end = start + page_size
+            consultants = list(queryset[start:end])
+
+        next_cursor = None
+        if keyset_ordering and len(consultants) == page_size:
+            last = consultants[-1]
+            next_cursor = f'{last.rating},{last.id}'
 
         serializer = ConsultantListSerializer(consultants, many=True)
 
@@ -125,6 +292,7 @@ class ConsultantListView(APIView):
                 'page_size': page_size,
                 'total_count': total_count,
                 'total_pages': (total_count + page_size - 1) // page_size,
+                'next_cursor': next_cursor,
             }
         })
 
@@ -136,18 +304,15 @@ class ConsultantPublicProfileView(APIView):
     """
     permission_classes = [AllowAny]
 
+    @method_decorator(cache_control(public=True, max_age=30, stale_while_revalidate=60))
+    @method_decorator(condition(etag_func=_public_profile_etag))
     def get(self, request, user_id):
         try:
             profile = ConsultantProfile.objects.select_related('user').prefetch_related(
-                'portfolio_items__images',
-                'skill_items',
-                'certification_items'
+                *self.get_prefetches()
             ).get(
                 user__id=user_id,
-                user__is_verified=True,
-                user__is_approved=True,
-                user__account_status='active',
-                user__role='consultant'
+                **PUBLIC_CONSULTANT_FILTERS
             )
         except ConsultantProfile.DoesNotExist:
             return Response(
@@ -158,36 +323,52 @@ class ConsultantPublicProfileView(APIView):
         serializer = ConsultantPublicProfileSerializer(profile)
         return Response(serializer.data)
 
+    @staticmethod
+    def get_prefetches():
+        """
+        Related-item prefetches narrowed to the columns rendered by
+        ConsultantPublicProfileSerializer (categories joined for their name).
+        """
+        images = PortfolioImage.objects.only(
+            'id', 'portfolio_id', 'image', 'caption', 'is_primary', 'order',
+        )
+        portfolio_items = ConsultantPortfolio.objects.select_related('category').only(
+            'id', 'consultant_id', 'title', 'title_ar', 'description', 'description_ar',
+            'category', 'category__name', 'client_name', 'project_url',
+            'completion_date', 'project_value', 'is_featured', 'order', 'created_at',
+        ).prefetch_related(Prefetch('images', queryset=images))
+        skill_items = ConsultantSkill.objects.select_related('category').only(
+            'id', 'consultant_id', 'name', 'name_ar', 'category', 'category__name',
+            'proficiency', 'years_experience', 'is_verified',
+        )
+        certification_items = ConsultantCertification.objects.only(
+            'id', 'consultant_id', 'name', 'name_ar', 'issuing_organization',
+            'credential_id', 'credential_url', 'issue_date', 'expiry_date',
+            'document', 'is_verified', 'created_at',
+        )
+        return [
+            Prefetch('portfolio_items', queryset=portfolio_items),
+            Prefetch('skill_items', queryset=skill_items),
+            Prefetch('certification_items', queryset=certification_items),
+        ]
 
-class PortfolioListView(APIView):
+
+class PortfolioListView(ConsultantProfileMixin, APIView):
     """
     List and create portfolio items.
     GET /api/v1/consultants/portfolio/
     POST /api/v1/consultants/portfolio/
     """
-    permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        if not hasattr(request.user, 'consultant_profile'):
-            return Response(
-                {'error': 'Only consultants can access portfolio'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-
         portfolio_items = ConsultantPortfolio.objects.filter(
-            consultant=request.user.consultant_profile
+            consultant=request.consultant_profile
         ).prefetch_related('images')
 
         serializer = ConsultantPortfolioSerializer(portfolio_items, many=True)
         return Response(serializer.data)
 
     def post(self, request):
-        if not hasattr(request.user, 'consultant_profile'):
-            return Response(
-                {'error': 'Only consultants can create portfolio items'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-
         serializer = ConsultantPortfolioCreateSerializer(
             data=request.data,
             context={'request': request}
@@ -201,20 +382,17 @@ class PortfolioListView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class PortfolioDetailView(APIView):
+class PortfolioDetailView(ConsultantProfileMixin, APIView):
     """
     Retrieve, update, delete portfolio item.
     GET/PUT/DELETE /api/v1/consultants/portfolio/{id}/
     """
-    permission_classes = [IsAuthenticated]
 
     def get_object(self, request, pk):
-        if not hasattr(request.user, 'consultant_profile'):
-            return None
         try:
             return ConsultantPortfolio.objects.get(
                 pk=pk,
-                consultant=request.user.consultant_profile
+                consultant=request.consultant_profile
             )
         except ConsultantPortfolio.DoesNotExist:
             return None
@@ -259,25 +437,18 @@ class PortfolioDetailView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class PortfolioImageUploadView(APIView):
+class PortfolioImageUploadView(ConsultantProfileMixin, APIView):
     """
     Upload images to portfolio item.
     POST /api/v1/consultants/portfolio/{id}/images/
     """
-    permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
 
     def post(self, request, pk):
-        if not hasattr(request.user, 'consultant_profile'):
-            return Response(
-                {'error': 'Only consultants can upload portfolio images'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-
         try:
             portfolio = ConsultantPortfolio.objects.get(
                 pk=pk,
-                consultant=request.user.consultant_profile
+                consultant=request.consultant_profile
             )
         except ConsultantPortfolio.DoesNotExist:
             return Response(
@@ -292,39 +463,45 @@ class PortfolioImageUploadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        created_images = []
-        for image in images:
-            portfolio_image = PortfolioImage.objects.create(
-                portfolio=portfolio,
-                image=image,
-                caption=request.data.get('caption', ''),
-                is_primary=len(created_images) == 0 and portfolio.images.count() == 0
-            )
-            created_images.append(portfolio_image)
+        caption = request.data.get('caption', '')
+        # Only a hint; the task settles the primary flag under a lock
+        has_images = portfolio.images.exists()
+
+        # Stash uploads in temporary storage; the task writes the final file
+        # and creates the row, so the request does not wait on storage I/O.
+        pending_images = []
+        for index, image in enumerate(images):
+            image_id = uuid.uuid4()
+            is_primary = index == 0 and not has_images
+            tmp_key = default_storage.save(
+                f'tmp/portfolio/{image_id}_{image.name}', image
+            )
+            transaction.on_commit(partial(
+                process_portfolio_image.delay,
+                str(image_id), str(portfolio.id), tmp_key, caption, is_primary,
+            ))
+            pending_images.append({
+                'id': image_id,
+                'caption': caption,
+                'is_primary': is_primary,
+                'status': 'pending',
+            })
 
-        serializer = PortfolioImageSerializer(created_images, many=True)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(pending_images, status=status.HTTP_202_ACCEPTED)
 
 
-class PortfolioImageDeleteView(APIView):
+class PortfolioImageDeleteView(ConsultantProfileMixin, APIView):
     """
     Delete portfolio image.
     DELETE /api/v1/consultants/portfolio/{portfolio_id}/images/{image_id}/
     """
-    permission_classes = [IsAuthenticated]
 
     def delete(self, request, portfolio_id, image_id):
-        if not hasattr(request.user, 'consultant_profile'):
-            return Response(
-                {'error': 'Only consultants can delete portfolio images'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-
         try:
             image = PortfolioImage.objects.get(
                 pk=image_id,
                 portfolio_id=portfolio_id,
-                portfolio__consultant=request.user.consultant_profile
+                portfolio__consultant=request.consultant_profile
             )
         except PortfolioImage.DoesNotExist:
             return Response(
@@ -336,34 +513,21 @@ class PortfolioImageDeleteView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class SkillListView(APIView):
+class SkillListView(ConsultantProfileMixin, APIView):
     """
     List and create skills.
     GET /api/v1/consultants/skills/
     POST /api/v1/consultants/skills/
     """
-    permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        if not hasattr(request.user, 'consultant_profile'):
-            return Response(
-                {'error': 'Only consultants can access skills'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-
         skills = ConsultantSkill.objects.filter(
-            consultant=request.user.consultant_profile
+            consultant=request.consultant_profile
         )
         serializer = ConsultantSkillSerializer(skills, many=True)
         return Response(serializer.data)
 
     def post(self, request):
-        if not hasattr(request.user, 'consultant_profile'):
-            return Response(
-                {'error': 'Only consultants can create skills'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-
         serializer = ConsultantSkillCreateSerializer(
             data=request.data,
             context={'request': request}
@@ -377,20 +541,17 @@ class SkillListView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class SkillDetailView(APIView):
+class SkillDetailView(ConsultantProfileMixin, APIView):
     """
     Update or delete skill.
     PUT/DELETE /api/v1/consultants/skills/{id}/
     """
-    permission_classes = [IsAuthenticated]
 
     def get_object(self, request, pk):
-        if not hasattr(request.user, 'consultant_profile'):
-            return None
         try:
             return ConsultantSkill.objects.get(
                 pk=pk,
-                consultant=request.user.consultant_profile
+                consultant=request.consultant_profile
             )
         except ConsultantSkill.DoesNotExist:
             return None
@@ -425,35 +586,22 @@ class SkillDetailView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class CertificationListView(APIView):
+class CertificationListView(ConsultantProfileMixin, APIView):
     """
     List and create certifications.
     GET /api/v1/consultants/certifications/
     POST /api/v1/consultants/certifications/
     """
-    permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
 
     def get(self, request):
-        if not hasattr(request.user, 'consultant_profile'):
-            return Response(
-                {'error': 'Only consultants can access certifications'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-
         certifications = ConsultantCertification.objects.filter(
-            consultant=request.user.consultant_profile
+            consultant=request.consultant_profile
         )
         serializer = ConsultantCertificationSerializer(certifications, many=True)
         return Response(serializer.data)
 
     def post(self, request):
-        if not hasattr(request.user, 'consultant_profile'):
-            return Response(
-                {'error': 'Only consultants can create certifications'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-
         serializer = ConsultantCertificationCreateSerializer(
             data=request.data,
             context={'request': request}
@@ -467,21 +615,18 @@ class CertificationListView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class CertificationDetailView(APIView):
+class CertificationDetailView(ConsultantProfileMixin, APIView):
     """
     Update or delete certification.
     PUT/DELETE /api/v1/consultants/certifications/{id}/
     """
-    permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
 
     def get_object(self, request, pk):
-        if not hasattr(request.user, 'consultant_profile'):
-            return None
         try:
             return ConsultantCertification.objects.get(
                 pk=pk,
-                consultant=request.user.consultant_profile
+                consultant=request.consultant_profile
             )
         except ConsultantCertification.DoesNotExist:
             return None
@@ -521,22 +666,25 @@ class AvailabilityStatusView(APIView):
     Update consultant availability status.
     PUT /api/v1/consultants/availability/
     """
-    permission_classes = [IsAuthenticated]
+    # No ConsultantProfileMixin: the update below does not need the profile row
+    permission_classes = [IsAuthenticated, IsConsultant]
 
     def put(self, request):
-        if not hasattr(request.user, 'consultant_profile'):
-            return Response(
-                {'error': 'Only consultants can update availability'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-
         serializer = AvailabilityStatusSerializer(data=request.data)
         if serializer.is_valid():
-            profile = request.user.consultant_profile
-            profile.availability_status = serializer.validated_data['availability_status']
-            profile.save(update_fields=['availability_status', 'updated_at'])
+            availability_status = serializer.validated_data['availability_status']
+            updated = ConsultantProfile.objects.filter(user=request.user).update(
+                availability_status=availability_status,
+                updated_at=timezone.now()
+            )
+            if not updated:
+                raise PermissionDeniedError('Consultant profile not found.')
+            # update() bypasses post_save, so invalidate the dashboard here
+            ConsultantDashboardCache.invalidate(request.user.id)
+            ConsultantDirectoryVersion.bump_list()
+            ConsultantDirectoryVersion.bump_profile(request.user.id)
             return Response({
-                'availability_status': profile.availability_status
+                'availability_status': availability_status
             })
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -578,12 +726,9 @@ class ProjectInvitationListView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        data = request.data.copy()
-        data['project'] = project_id
-
         serializer = ProjectInvitationCreateSerializer(
-            data=data,
-            context={'request': request}
+            data=request.data,
+            context={'request': request, 'project_id': project_id}
         )
         if serializer.is_valid():
             invitation = serializer.save()
@@ -609,37 +754,46 @@ class ProjectInvitationResponseView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        try:
-            invitation = ProjectInvitation.objects.get(
-                pk=pk,
-                consultant=request.user,
-                status='pending'
-            )
-        except ProjectInvitation.DoesNotExist:
+        if action not in ('accept', 'decline'):
             return Response(
-                {'error': 'Invitation not found or already responded'},
-                status=status.HTTP_404_NOT_FOUND
+                {'error': 'Invalid action'},
+                status=status.HTTP_400_BAD_REQUEST
             )
 
-        if invitation.is_expired:
-            invitation.status = 'expired'
-            invitation.save(update_fields=['status', 'updated_at'])
+        pending = ProjectInvitation.objects.filter(
+            pk=pk,
+            consultant=request.user,
+            status='pending'
+        )
+
+        # Expire in a single conditional UPDATE, without fetching the row
+        now = timezone.now()
+        if pending.filter(expires_at__lt=now).update(status='expired', updated_at=now):
+            # update() bypasses post_save, so invalidate the dashboard here
+            ConsultantDashboardCache.invalidate(request.user.id)
             return Response(
                 {'error': 'Invitation has expired'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        if action == 'accept':
-            invitation.accept()
-            message = 'Invitation accepted'
-        elif action == 'decline':
-            invitation.decline()
-            message = 'Invitation declined'
-        else:
-            return Response(
-                {'error': 'Invalid action'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        # Lock the invitation row so concurrent responses cannot both apply
+        with transaction.atomic():
+            try:
+                invitation = pending.select_related(
+                    'project', 'invited_by', 'consultant'
+                ).select_for_update(of=('self',)).get()
+            except ProjectInvitation.DoesNotExist:
+                return Response(
+                    {'error': 'Invitation not found or already responded'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
+            if action == 'accept':
+                invitation.accept()
+                message = 'Invitation accepted'
+            else:
+                invitation.decline()
+                message = 'Invitation declined'
 
         return Response({
             'message': message,
@@ -647,43 +801,50 @@ class ProjectInvitationResponseView(APIView):
         })
 
 
-class ConsultantDashboardView(APIView):
+class ConsultantDashboardView(ConsultantProfileMixin, APIView):
     """
     Get consultant dashboard statistics.
     GET /api/v1/consultants/dashboard/
     """
-    permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        if not hasattr(request.user, 'consultant_profile'):
-            return Response(
-                {'error': 'Only consultants can access dashboard'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-
-        profile = request.user.consultant_profile
-
-        # Get pending invitations count
-        pending_invitations = ProjectInvitation.objects.filter(
-            consultant=request.user,
-            status='pending'
-        ).count()
-
-        # Get active proposals count
-        active_proposals = request.user.proposals.filter(
-            status__in=['pending', 'shortlisted']
-        ).count() if hasattr(request.user, 'proposals') else 0
-
-        # Get portfolio items count
-        portfolio_count = profile.portfolio_items.count()
-
-        # Get skills count
-        skills_count = profile.skill_items.count()
-
-        # Get certifications count
-        certifications_count = profile.certification_items.count()
-
-        return Response({
+        payload = ConsultantDashboardCache.get_or_set(
+            request.user.id,
+            lambda: self.build_dashboard(request.consultant_profile)
+        )
+        return Response(payload)
+
+    @staticmethod
+    def build_dashboard(profile):
+        """Build the dashboard payload for a consultant profile."""
+        # All five counters in a single query via correlated subqueries
+        stats = ConsultantProfile.objects.filter(pk=profile.pk).annotate(
+            pending_invitations=_count_subquery(
+                ProjectInvitation.objects.filter(status='pending'),
+                'consultant', OuterRef('user_id')
+            ),
+            active_proposals=_count_subquery(
+                Proposal.objects.filter(status__in=['pending', 'shortlisted']),
+                'consultant', OuterRef('user_id')
+            ),
+            portfolio_items_count=_count_subquery(
+                ConsultantPortfolio.objects.all(), 'consultant', OuterRef('pk')
+            ),
+            skills_count=_count_subquery(
+                ConsultantSkill.objects.all(), 'consultant', OuterRef('pk')
+            ),
+            certifications_count=_count_subquery(
+                ConsultantCertification.objects.all(), 'consultant', OuterRef('pk')
+            ),
+        ).values(
+            'pending_invitations',
+            'active_proposals',
+            'portfolio_items_count',
+            'skills_count',
+            'certifications_count',
+        ).get()
+
+        return {
             'profile': {
                 'full_name': profile.full_name,
                 'avatar': profile.avatar.url if profile.avatar else None,
@@ -694,10 +855,10 @@ class ConsultantDashboardView(APIView):
                 'total_earned': float(profile.total_earned),
             },
             'stats': {
-                'pending_invitations': pending_invitations,
-                'active_proposals': active_proposals,
-                'portfolio_items': portfolio_count,
-                'skills': skills_count,
-                'certifications': certifications_count,
+                'pending_invitations': stats['pending_invitations'],
+                'active_proposals': stats['active_proposals'],
+                'portfolio_items': stats['portfolio_items_count'],
+                'skills': stats['skills_count'],
+                'certifications': stats['certifications_count'],
             }
-        })
+        }
@@ -1,10 +1,17 @@
 """
 Profile views.
 """
+import hashlib
 import logging
 import os
 
 from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from rest_framework import status
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticated
@@ -12,6 +19,9 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.accounts.models import User
+from apps.core.utils import normalize_saudi_mobile
+from apps.accounts.services import AvatarService
+from apps.accounts.tasks import delete_avatar_files, generate_avatar_thumbnails
 from apps.accounts.serializers.profile import (
     UserSerializer,
     IndividualProfileSerializer,
@@ -24,6 +34,66 @@ logger = logging.getLogger(__name__)
 # Allowed image types for avatars
 ALLOWED_AVATAR_TYPES = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
 MAX_AVATAR_SIZE = 5 * 1024 * 1024  # 5MB
+# Allowance for multipart boundaries/headers when checking Content-Length
+MULTIPART_OVERHEAD = 4096
+
+# Leading magic bytes of the allowed avatar formats
+AVATAR_SIGNATURES = (
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+
+# User fields that can be updated through the profile endpoint
+USER_FIELDS = ('mobile', 'preferred_language')
+
+# Profile relation and serializer per user: consultants by role, clients by user_type
+CONSULTANT_PROFILE = ('consultant_profile', ConsultantProfileSerializer)
+CLIENT_PROFILES = {
+    User.UserType.INDIVIDUAL: ('individual_profile', IndividualProfileSerializer),
+    User.UserType.ORGANIZATION: ('organization_profile', OrganizationProfileSerializer),
+}
+
+
+def resolve_profile(user):
+    """
+    Return (profile, serializer_class) for the user.
+    Falls back to (None, UserSerializer) when the user has no profile.
+    """
+    if user.role == 'consultant':
+        attr, serializer_class = CONSULTANT_PROFILE
+    else:
+        attr, serializer_class = CLIENT_PROFILES.get(user.user_type, (None, UserSerializer))
+    profile = getattr(user, attr, None) if attr else None
+    return profile, serializer_class
+
+
+def sniff_image_type(file):
+    """
+    Detect an image's MIME type from its first 12 bytes.
+    Unlike file.content_type this does not trust the client.
+    Returns None for unrecognized content.
+    """
+    head = file.read(12)
+    file.seek(0)
+    for signature, content_type in AVATAR_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+def _profile_etag(request):
+    """
+    ETag for the current user's profile: changes whenever the user row or
+    the profile row is updated. Both are already loaded with request.user.
+    """
+    user = request.user
+    profile, _ = resolve_profile(user)
+    key = f"{user.pk}|{user.updated_at}|{profile.updated_at if profile else ''}"
+    return hashlib.md5(key.encode()).hexdigest()
 
 
 class ProfileView(APIView):
@@ -34,36 +104,13 @@ class ProfileView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
-    def get_serializer_class(self, user):
-        """Get appropriate serializer based on user role/type."""
-        # Check role first for consultants
-        if user.role == 'consultant':
-            return ConsultantProfileSerializer
-        # Then check user_type for clients
-        if user.user_type == User.UserType.INDIVIDUAL:
-            return IndividualProfileSerializer
-        elif user.user_type == User.UserType.ORGANIZATION:
-            return OrganizationProfileSerializer
-        return UserSerializer
-
-    def get_profile(self, user):
-        """Get user profile based on role/type."""
-        # Check role first for consultants
-        if user.role == 'consultant':
-            return getattr(user, 'consultant_profile', None)
-        # Then check user_type for clients
-        if user.user_type == User.UserType.INDIVIDUAL:
-            return getattr(user, 'individual_profile', None)
-        elif user.user_type == User.UserType.ORGANIZATION:
-            return getattr(user, 'organization_profile', None)
-        return None
-
+    @method_decorator(cache_control(private=True, no_cache=True))
+    @method_decorator(condition(etag_func=_profile_etag))
     def get(self, request):
         user = request.user
-        profile = self.get_profile(user)
+        profile, serializer_class = resolve_profile(user)
 
         if profile:
-            serializer_class = self.get_serializer_class(user)
             serializer = serializer_class(profile, context={'request': request})
             data = serializer.data
         else:
@@ -83,7 +130,7 @@ class ProfileView(APIView):
 
     def _update_profile(self, request, partial=False):
         user = request.user
-        profile = self.get_profile(user)
+        profile, serializer_class = resolve_profile(user)
 
         if not profile:
             return Response({
@@ -93,18 +140,26 @@ class ProfileView(APIView):
                 }
             }, status=status.HTTP_404_NOT_FOUND)
 
-        serializer_class = self.get_serializer_class(user)
         serializer = serializer_class(profile, data=request.data, partial=partial, context={'request': request})
         serializer.is_valid(raise_exception=True)
-        serializer.save()
 
         # Update user fields if provided
-        user_fields = ['mobile', 'preferred_language']
-        user_data = {k: v for k, v in request.data.items() if k in user_fields}
-        if user_data:
-            for key, value in user_data.items():
-                setattr(user, key, value)
-            user.save(update_fields=list(user_data.keys()) + ['updated_at'])
+        user_data = {f: request.data[f] for f in USER_FIELDS if f in request.data}
+        if user_data.get('mobile'):
+            # Normalize as User.save() would, since update() skips it
+            user_data['mobile'] = normalize_saudi_mobile(user_data['mobile']) or user_data['mobile']
+
+        # Only write the fields whose values actually change
+        changed = {k: v for k, v in user_data.items() if getattr(user, k) != v}
+
+        # Profile and user writes commit (or roll back) together
+        with transaction.atomic(savepoint=False):
+            serializer.save()
+            if changed:
+                User.objects.filter(pk=user.pk).update(updated_at=timezone.now(), **changed)
+
+        for key, value in changed.items():
+            setattr(user, key, value)
 
         return Response({
             'success': True,
@@ -142,6 +197,17 @@ class AvatarUploadView(APIView):
                 'message': 'Profile not found'
             }, status=status.HTTP_404_NOT_FOUND)
 
+        # Reject oversized uploads from the header, before the body is read
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            content_length = 0
+        if content_length > MAX_AVATAR_SIZE + MULTIPART_OVERHEAD:
+            return Response({
+                'success': False,
+                'message': 'File too large. Maximum size is 5MB'
+            }, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
         # Check if file was provided
         if 'file' not in request.FILES:
             return Response({
@@ -151,12 +217,12 @@ class AvatarUploadView(APIView):
 
         file = request.FILES['file']
 
-        # Validate file type
-        if file.content_type not in ALLOWED_AVATAR_TYPES:
+        # Validate file type from its content, not the client-supplied header
+        if sniff_image_type(file) not in ALLOWED_AVATAR_TYPES:
             return Response({
                 'success': False,
                 'message': f'Invalid file type. Allowed types: JPEG, PNG, GIF, WebP'
-            }, status=status.HTTP_400_BAD_REQUEST)
+            }, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
 
         # Validate file size
         if file.size > MAX_AVATAR_SIZE:
@@ -165,24 +231,31 @@ class AvatarUploadView(APIView):
                 'message': f'File too large. Maximum size is 5MB'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        # Delete old avatar if exists
-        old_file = getattr(profile, field_name)
-        if old_file:
-            try:
-                old_file.delete(save=False)
-            except Exception as e:
-                logger.warning(f"Failed to delete old avatar: {e}")
+        old_name = getattr(profile, field_name).name
 
-        # Save new avatar
-        setattr(profile, field_name, file)
+        # Save new avatar under a content-hashed name (safe to cache forever);
+        # the user's own earlier copy in storage is reused instead of re-uploaded
+        file.name = AvatarService.get_hashed_name(file, user.id)
+        key = profile._meta.get_field(field_name).generate_filename(profile, file.name)
+        is_stored = default_storage.exists(key)
+        setattr(profile, field_name, key if is_stored else file)
         profile.save()
 
         # Get the URL of the uploaded file (absolute URL)
         new_file = getattr(profile, field_name)
         if new_file:
             avatar_url = request.build_absolute_uri(new_file.url)
+            # Thumbnails are rendered in the background at predictable names
+            if not is_stored:
+                generate_avatar_thumbnails.delay(new_file.name)
+            thumbnails = AvatarService.get_thumbnail_urls(new_file.name, request)
         else:
             avatar_url = None
+            thumbnails = {}
+
+        # Delete the old avatar in the background (unless re-uploaded unchanged)
+        if old_name and old_name != new_file.name:
+            transaction.on_commit(lambda: delete_avatar_files.delay(old_name))
 
         logger.info(f"Avatar uploaded for user {user.id}")
 
@@ -190,7 +263,8 @@ class AvatarUploadView(APIView):
             'success': True,
             'message': 'Profile picture uploaded successfully',
             'data': {
-                'avatar_url': avatar_url
+                'avatar_url': avatar_url,
+                'thumbnails': thumbnails,
             }
         }, status=status.HTTP_200_OK)
 
@@ -208,14 +282,12 @@ class AvatarUploadView(APIView):
         # Delete avatar if exists
         current_file = getattr(profile, field_name)
         if current_file:
-            try:
-                current_file.delete(save=False)
-            except Exception as e:
-                logger.warning(f"Failed to delete avatar file: {e}")
-
+            current_name = current_file.name
             setattr(profile, field_name, None)
             profile.save()
 
+            transaction.on_commit(lambda: delete_avatar_files.delay(current_name))
+
             logger.info(f"Avatar deleted for user {user.id}")
 
             return Response({
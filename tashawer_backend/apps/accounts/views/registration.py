@@ -1,6 +1,7 @@
 """
 Registration views for different user types.
 """
+from django.db import transaction
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -11,28 +12,30 @@ from apps.accounts.serializers.registration import (
     OrganizationRegistrationSerializer,
     ConsultantRegistrationSerializer,
 )
-from apps.accounts.services.email_service import EmailService
+from apps.accounts.tasks import send_verification_email
 
 
-class IndividualRegistrationView(APIView):
+class RegistrationView(APIView):
     """
-    POST: Register as individual user.
-    Implements NUW-13: Register as Individual User
+    POST: Register a user with `serializer_class`.
+    Subclasses set the serializer and the success message.
     """
     permission_classes = [AllowAny]
+    serializer_class = None
+    success_message = 'Registration successful. Please check your email to verify your account.'
 
     def post(self, request):
-        serializer = IndividualRegistrationSerializer(data=request.data)
+        serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         user = serializer.save()
 
-        # Send verification email
-        EmailService.send_verification_email(user)
+        # Send verification email once the user row is committed
+        transaction.on_commit(lambda: send_verification_email.delay(str(user.id)))
 
         return Response({
             'success': True,
-            'message': 'Registration successful. Please check your email to verify your account.',
+            'message': self.success_message,
             'data': {
                 'user_id': str(user.id),
                 'email': user.email,
@@ -42,57 +45,29 @@ class IndividualRegistrationView(APIView):
         }, status=status.HTTP_201_CREATED)
 
 
-class OrganizationRegistrationView(APIView):
+class IndividualRegistrationView(RegistrationView):
     """
-    POST: Register as organization.
-    Implements NUW-14: Register as Organization (Company / Office)
+    POST: Register as individual user.
+    Implements NUW-13: Register as Individual User
     """
-    permission_classes = [AllowAny]
+    serializer_class = IndividualRegistrationSerializer
 
-    def post(self, request):
-        serializer = OrganizationRegistrationSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        user = serializer.save()
 
-        # Send verification email
-        EmailService.send_verification_email(user)
-
-        return Response({
-            'success': True,
-            'message': 'Registration successful. Please check your email to verify your account.',
-            'data': {
-                'user_id': str(user.id),
-                'email': user.email,
-                'registration_no': user.registration_no,
-                'user_type': user.user_type,
-            }
-        }, status=status.HTTP_201_CREATED)
+class OrganizationRegistrationView(RegistrationView):
+    """
+    POST: Register as organization.
+    Implements NUW-14: Register as Organization (Company / Office)
+    """
+    serializer_class = OrganizationRegistrationSerializer
 
 
-class ConsultantRegistrationView(APIView):
+class ConsultantRegistrationView(RegistrationView):
     """
     POST: Register as consultant.
     Implements NUW-15: Register as Consultant (Individual or Office)
     """
-    permission_classes = [AllowAny]
-
-    def post(self, request):
-        serializer = ConsultantRegistrationSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        user = serializer.save()
-
-        # Send verification email
-        EmailService.send_verification_email(user)
-
-        return Response({
-            'success': True,
-            'message': 'Registration successful. Please check your email to verify your account. Your account will be reviewed by our team.',
-            'data': {
-                'user_id': str(user.id),
-                'email': user.email,
-                'registration_no': user.registration_no,
-                'user_type': user.user_type,
-            }
-        }, status=status.HTTP_201_CREATED)
+    serializer_class = ConsultantRegistrationSerializer
+    success_message = (
+        'Registration successful. Please check your email to verify your account. '
+        'Your account will be reviewed by our team.'
+    )
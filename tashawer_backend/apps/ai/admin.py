@@ -14,7 +14,9 @@ class AIGenerationAdmin(admin.ModelAdmin):
         'created_at',
     ]
     list_filter = ['generation_type', 'status', 'created_at']
-    search_fields = ['user__email', 'input_text']
+    list_select_related = ['user']
+    search_fields = ['user__email', 'input_preview']
+    autocomplete_fields = ['project', 'proposal']
     readonly_fields = [
         'id',
         'user',
@@ -30,6 +32,24 @@ class AIGenerationAdmin(admin.ModelAdmin):
     ]
     date_hierarchy = 'created_at'
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        changelist = f'{self.opts.app_label}_{self.opts.model_name}_changelist'
+        if request.resolver_match and request.resolver_match.url_name == changelist:
+            # Skip the compressed input/output blobs on the list page
+            queryset = queryset.select_related('user').only(
+                'id',
+                'generation_type',
+                'status',
+                'tokens_used',
+                'processing_time_ms',
+                'created_at',
+                'user__email',
+            )
+        else:
+            queryset = queryset.select_related('user', 'project', 'proposal')
+        return queryset
+
 
 @admin.register(AIUsageLimit)
 class AIUsageLimitAdmin(admin.ModelAdmin):
@@ -41,5 +61,7 @@ class AIUsageLimitAdmin(admin.ModelAdmin):
         'monthly_limit',
         'total_generations',
     ]
+    list_select_related = ['user']
     search_fields = ['user__email']
+    autocomplete_fields = ['user']
     list_editable = ['daily_limit', 'monthly_limit']
@@ -5,3 +5,7 @@ class AiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.ai'
     verbose_name = 'AI Services'
+
+    def ready(self):
+        # Import signals
+        import apps.ai.signals  # noqa
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:12
+
+import zlib
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+from apps.core.migrations_ops import AddPostgresIndex
+
+
+def compress_existing(apps, schema_editor):
+    AIGeneration = apps.get_model('ai', 'AIGeneration')
+    for generation in AIGeneration.objects.only('id', 'input_text', 'output_text').iterator():
+        AIGeneration.objects.filter(pk=generation.pk).update(
+            input_blob=zlib.compress((generation.input_text or '').encode('utf-8'), 6),
+            input_preview=(generation.input_text or '')[:200],
+            output_blob=(
+                zlib.compress(generation.output_text.encode('utf-8'), 6)
+                if generation.output_text is not None else None
+            ),
+        )
+
+
+def decompress_existing(apps, schema_editor):
+    AIGeneration = apps.get_model('ai', 'AIGeneration')
+    for generation in AIGeneration.objects.only('id', 'input_blob', 'output_blob').iterator():
+        AIGeneration.objects.filter(pk=generation.pk).update(
+            input_text=zlib.decompress(bytes(generation.input_blob)).decode('utf-8'),
+            output_text=(
+                zlib.decompress(bytes(generation.output_blob)).decode('utf-8')
+                if generation.output_blob is not None else None
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0001_initial'),
+        # pg_trgm is created there
+        ('accounts', '0005_consultant_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aigeneration',
+            name='input_blob',
+            field=models.BinaryField(default=b'', help_text='Compressed input provided by the user'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='aigeneration',
+            name='input_preview',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='aigeneration',
+            name='output_blob',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        # Nullable before removal so the migration can be reversed with data present
+        migrations.AlterField(
+            model_name='aigeneration',
+            name='input_text',
+            field=models.TextField(help_text='The input provided by the user', null=True),
+        ),
+        migrations.RunPython(compress_existing, decompress_existing),
+        migrations.RemoveField(
+            model_name='aigeneration',
+            name='input_text',
+        ),
+        migrations.RemoveField(
+            model_name='aigeneration',
+            name='output_text',
+        ),
+        AddPostgresIndex(
+            model_name='aigeneration',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['input_preview'], name='ai_gen_input_preview_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0002_compress_aigeneration_text'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aiusagelimit',
+            index=models.Index(fields=['user'], include=('daily_used', 'daily_limit', 'daily_reset_at', 'monthly_used', 'monthly_limit', 'monthly_reset_at'), name='ai_usage_cover'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0003_usage_limit_covering_index'),
+        ('projects', '0002_initial_categories'),
+        ('proposals', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aigeneration',
+            index=models.Index(fields=['user', '-created_at'], name='ai_gen_user_recent_idx'),
+        ),
+    ]
@@ -3,10 +3,26 @@ AI Generation models for tracking usage and history.
 """
 
 import uuid
+import zlib
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.conf import settings
 
 
+def compress_text(value):
+    """Compress text for storage in a BinaryField."""
+    if value is None:
+        return None
+    return zlib.compress(str(value).encode('utf-8'), 6)
+
+
+def decompress_text(value):
+    """Decode text stored by compress_text."""
+    if value is None:
+        return None
+    return zlib.decompress(bytes(value)).decode('utf-8')
+
+
 class AIGeneration(models.Model):
     """
     Track AI generation requests and usage.
@@ -40,16 +56,17 @@ class AIGeneration(models.Model):
         default=Status.PENDING
     )
 
-    # Input data
-    input_text = models.TextField(help_text="The input provided by the user")
+    # Input data (zlib-compressed; use input_text)
+    input_blob = models.BinaryField(help_text="Compressed input provided by the user")
+    input_preview = models.CharField(max_length=200, blank=True, default='')
     input_language = models.CharField(
         max_length=2,
         choices=[('ar', 'Arabic'), ('en', 'English')],
         default='ar'
     )
 
-    # Output data
-    output_text = models.TextField(blank=True, null=True)
+    # Output data (zlib-compressed; use output_text)
+    output_blob = models.BinaryField(blank=True, null=True)
     output_language = models.CharField(
         max_length=2,
         choices=[('ar', 'Arabic'), ('en', 'English')],
@@ -89,11 +106,34 @@ class AIGeneration(models.Model):
             models.Index(fields=['user', 'generation_type']),
             models.Index(fields=['status']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['user', '-created_at'], name='ai_gen_user_recent_idx'),
+            GinIndex(
+                fields=['input_preview'],
+                name='ai_gen_input_preview_trgm',
+                opclasses=['gin_trgm_ops'],
+            ),
         ]
 
     def __str__(self):
         return f"{self.get_generation_type_display()} by {self.user.email} - {self.status}"
 
+    @property
+    def input_text(self):
+        return decompress_text(self.input_blob)
+
+    @input_text.setter
+    def input_text(self, value):
+        self.input_blob = compress_text(value or '')
+        self.input_preview = (value or '')[:200]
+
+    @property
+    def output_text(self):
+        return decompress_text(self.output_blob)
+
+    @output_text.setter
+    def output_text(self, value):
+        self.output_blob = compress_text(value)
+
 
 class AIUsageLimit(models.Model):
     """
@@ -126,6 +166,17 @@ class AIUsageLimit(models.Model):
 
     class Meta:
         db_table = 'ai_usage_limits'
+        indexes = [
+            # Covering index: limit checks are index-only scans on PostgreSQL
+            models.Index(
+                fields=['user'],
+                include=[
+                    'daily_used', 'daily_limit', 'daily_reset_at',
+                    'monthly_used', 'monthly_limit', 'monthly_reset_at',
+                ],
+                name='ai_usage_cover',
+            ),
+        ]
 
     def __str__(self):
         return f"AI Usage for {self.user.email}"
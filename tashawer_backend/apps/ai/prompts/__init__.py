@@ -1,16 +1,41 @@
-from .scope import SCOPE_GENERATION_SYSTEM, SCOPE_GENERATION_USER, SCOPE_REFINE_SYSTEM, SCOPE_REFINE_USER
-from .deliverables import DELIVERABLES_SYSTEM, DELIVERABLES_USER
-from .proposal import PROPOSAL_SYSTEM_AR, PROPOSAL_SYSTEM_EN, PROPOSAL_USER_AR, PROPOSAL_USER_EN
+from .template import PromptTemplate
+from .scope import (
+    SCOPE_GENERATION_SYSTEM, SCOPE_GENERATION_USER, SCOPE_REFINE_SYSTEM, SCOPE_REFINE_USER,
+    SCOPE_GENERATION_USER_TEMPLATE, SCOPE_REFINE_USER_TEMPLATE, SCOPE_RESPONSE_SCHEMA,
+    SCOPE_CATEGORY_LABEL, SCOPE_BUDGET_RANGE_LABEL, SCOPE_REFINE_FOCUS_LABEL,
+)
+from .deliverables import (
+    DELIVERABLES_SYSTEM, DELIVERABLES_USER, DELIVERABLES_USER_TEMPLATE, DELIVERABLES_REQUIREMENTS_LABEL,
+)
+from .proposal import (
+    PROPOSAL_SYSTEM_AR, PROPOSAL_SYSTEM_EN, PROPOSAL_USER_AR, PROPOSAL_USER_EN,
+    PROPOSAL_USER_AR_TEMPLATE, PROPOSAL_USER_EN_TEMPLATE, PROPOSAL_RESPONSE_SCHEMA,
+    PROPOSAL_LABELS_AR, PROPOSAL_LABELS_EN,
+)
 
 __all__ = [
+    'PromptTemplate',
     'SCOPE_GENERATION_SYSTEM',
     'SCOPE_GENERATION_USER',
+    'SCOPE_GENERATION_USER_TEMPLATE',
     'SCOPE_REFINE_SYSTEM',
     'SCOPE_REFINE_USER',
+    'SCOPE_REFINE_USER_TEMPLATE',
+    'SCOPE_RESPONSE_SCHEMA',
+    'SCOPE_CATEGORY_LABEL',
+    'SCOPE_BUDGET_RANGE_LABEL',
+    'SCOPE_REFINE_FOCUS_LABEL',
     'DELIVERABLES_SYSTEM',
     'DELIVERABLES_USER',
+    'DELIVERABLES_USER_TEMPLATE',
+    'DELIVERABLES_REQUIREMENTS_LABEL',
     'PROPOSAL_SYSTEM_AR',
     'PROPOSAL_SYSTEM_EN',
     'PROPOSAL_USER_AR',
+    'PROPOSAL_USER_AR_TEMPLATE',
     'PROPOSAL_USER_EN',
+    'PROPOSAL_USER_EN_TEMPLATE',
+    'PROPOSAL_RESPONSE_SCHEMA',
+    'PROPOSAL_LABELS_AR',
+    'PROPOSAL_LABELS_EN',
 ]
@@ -2,6 +2,8 @@
 Deliverables generation prompts for Claude AI.
 """
 
+from .template import PromptTemplate
+
 DELIVERABLES_SYSTEM = """أنت خبير في إدارة المشاريع متخصص في تحديد مخرجات المشاريع والمراحل.
 
 You are a project management expert specialized in defining project deliverables and milestones.
@@ -33,3 +35,9 @@ Based on the following scope of work, generate a detailed list of deliverables a
 عدد المراحل المطلوبة / Number of milestones required: {num_milestones}
 
 {additional_requirements}"""
+
+# Prefix for the optional requirements section (bilingual)
+DELIVERABLES_REQUIREMENTS_LABEL = "متطلبات إضافية / Additional Requirements:\n"
+
+# Compiled once at import; render with .render(**values)
+DELIVERABLES_USER_TEMPLATE = PromptTemplate(DELIVERABLES_USER)
@@ -2,6 +2,8 @@
 Proposal generation prompts for Claude AI.
 """
 
+from .template import PromptTemplate
+
 PROPOSAL_SYSTEM_AR = """أنت مستشار هندسي محترف على منصة تشاور. مهمتك هي كتابة خطاب تغطية (Cover Letter) احترافي ومقنع للتقدم على مشروع.
 
 قواعد مهمة:
@@ -97,3 +99,35 @@ Name: {consultant_name}
 {additional_context}
 
 Remember: Respond in JSON format only with cover_letter, estimated_duration_days, estimated_amount, and estimation_reasoning"""
+
+# Prefixes for the optional user prompt sections, per prompt language
+PROPOSAL_LABELS_AR = {
+    'bio': 'نبذة: ',
+    'experience': 'الخبرات ذات الصلة:\n',
+    'budget_hint': 'تلميح ميزانية العميل: ',
+    'duration_hint': 'تلميح المدة من المستشار: ',
+    'notes': 'ملاحظات إضافية: ',
+}
+PROPOSAL_LABELS_EN = {
+    'bio': 'Bio: ',
+    'experience': 'Relevant Experience:\n',
+    'budget_hint': "Client's budget hint: ",
+    'duration_hint': 'Duration hint from consultant: ',
+    'notes': 'Additional Notes: ',
+}
+
+# Tool input schema used to force a structured proposal response
+PROPOSAL_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "cover_letter": {"type": "string", "description": "The cover letter text"},
+        "estimated_duration_days": {"type": "integer", "description": "Estimated duration in days"},
+        "estimated_amount": {"type": "number", "description": "Estimated cost in SAR"},
+        "estimation_reasoning": {"type": "string", "description": "Brief explanation of duration and cost estimation"},
+    },
+    "required": ["cover_letter", "estimated_duration_days", "estimated_amount", "estimation_reasoning"],
+}
+
+# Compiled once at import; render with .render(**values)
+PROPOSAL_USER_AR_TEMPLATE = PromptTemplate(PROPOSAL_USER_AR)
+PROPOSAL_USER_EN_TEMPLATE = PromptTemplate(PROPOSAL_USER_EN)
@@ -3,6 +3,8 @@ Scope generation prompts for Claude AI.
 Bilingual support (Arabic/English) with Arabic-first approach.
 """
 
+from .template import PromptTemplate
+
 SCOPE_GENERATION_SYSTEM = """أنت خبير استشاري محترف متخصص في كتابة نطاقات عمل المشاريع الاستشارية. مهمتك هي تحويل وصف موجز للمشروع إلى نطاق عمل شامل ومفصل مع تقديرات للميزانية والجدول الزمني.
 
 You are a professional consulting expert specialized in writing project scopes. Your task is to transform a brief project description into a comprehensive scope with budget and timeline estimates.
@@ -86,3 +88,30 @@ Review the following scope of work and provide an improved version with explanat
 ---
 
 {improvement_focus}"""
+
+# Prefixes for the optional user prompt sections (bilingual)
+SCOPE_CATEGORY_LABEL = "فئة المشروع / Project Category: "
+SCOPE_BUDGET_RANGE_LABEL = "نطاق الميزانية / Budget Range: "
+SCOPE_REFINE_FOCUS_LABEL = "مجالات التركيز للتحسين / Focus Areas for Improvement:\n"
+
+# Tool input schema used to force a structured scope response
+SCOPE_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string", "description": "Suggested project title (concise, 5-10 words)"},
+        "description": {"type": "string", "description": "Brief project description (2-3 sentences)"},
+        "scope": {"type": "string", "description": "Detailed scope of work (Markdown)"},
+        "budget_min": {"type": "number", "description": "Minimum budget in SAR"},
+        "budget_max": {"type": "number", "description": "Maximum budget in SAR"},
+        "estimated_duration_days": {"type": "integer", "description": "Estimated duration in days"},
+        "budget_reasoning": {"type": "string", "description": "Budget estimation reasoning"},
+    },
+    "required": [
+        "title", "description", "scope", "budget_min", "budget_max",
+        "estimated_duration_days", "budget_reasoning",
+    ],
+}
+
+# Compiled once at import; render with .render(**values)
+SCOPE_GENERATION_USER_TEMPLATE = PromptTemplate(SCOPE_GENERATION_USER)
+SCOPE_REFINE_USER_TEMPLATE = PromptTemplate(SCOPE_REFINE_USER)
@@ -0,0 +1,30 @@
+"""
+Precompiled prompt templates.
+"""
+from string import Formatter
+
+
+class PromptTemplate:
+    """
+    A str.format-style template parsed once at import time.
+    Rendering joins the precomputed literal chunks with the given values;
+    missing fields render as empty strings instead of raising KeyError.
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        self._parts = [
+            (literal, field)
+            for literal, field, _spec, _conversion in Formatter().parse(template)
+        ]
+
+    def render(self, **values) -> str:
+        chunks = []
+        for literal, field in self._parts:
+            chunks.append(literal)
+            if field is not None:
+                chunks.append(str(values.get(field, '')))
+        return ''.join(chunks)
+
+    def __str__(self):
+        return self.template
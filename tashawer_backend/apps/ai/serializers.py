@@ -3,6 +3,8 @@ Serializers for AI services.
 """
 
 from rest_framework import serializers
+
+from apps.core.serializers import CachedFieldsMixin
 from .models import AIGeneration
 
 
@@ -119,6 +121,16 @@ class ProposalGenerateSerializer(serializers.Serializer):
         return data
 
 
+class ProposalGenerateBatchSerializer(serializers.Serializer):
+    """Serializer for batch proposal generation request."""
+
+    proposals = ProposalGenerateSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=16,
+    )
+
+
 class ProposalPDFSerializer(serializers.Serializer):
     """Serializer for proposal PDF generation request."""
 
@@ -151,7 +163,7 @@ class ProposalPDFSerializer(serializers.Serializer):
         return data
 
 
-class AIGenerationSerializer(serializers.ModelSerializer):
+class AIGenerationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for AI generation history."""
 
     user_email = serializers.EmailField(source='user.email', read_only=True)
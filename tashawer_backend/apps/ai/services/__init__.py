@@ -1,11 +1,25 @@
-from .claude import ClaudeService
+from .claude import ClaudeResult, ClaudeService, get_claude_service
 from .scope_generator import ScopeGeneratorService
 from .proposal_generator import ProposalGeneratorService
 from .pdf_generator import PDFGeneratorService
+from .pdf_jobs import ProposalPDFJobs
+from .response_cache import AIResponseCache
+from .experience_cache import ConsultantExperienceCache
+from .usage_counter import AIUsageCounter
+from .inflight import AIInflightGauge
+from .generation import AIGenerationService
 
 __all__ = [
+    'ClaudeResult',
     'ClaudeService',
+    'get_claude_service',
     'ScopeGeneratorService',
     'ProposalGeneratorService',
     'PDFGeneratorService',
+    'ProposalPDFJobs',
+    'AIResponseCache',
+    'ConsultantExperienceCache',
+    'AIUsageCounter',
+    'AIInflightGauge',
+    'AIGenerationService',
 ]
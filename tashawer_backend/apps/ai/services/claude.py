@@ -2,20 +2,80 @@
 Claude AI API integration service.
 """
 
+import importlib.util
 import logging
 import time
-from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Dict, Any, Generator
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
-try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+# anthropic is imported on first use; its import graph is heavy and most
+# requests never talk to Claude
+ANTHROPIC_AVAILABLE = importlib.util.find_spec('anthropic') is not None
+if not ANTHROPIC_AVAILABLE:
     logger.warning("Anthropic package not installed. AI features will not work.")
 
 
+# Anthropic clients keyed by API key. Sharing one client per worker reuses
+# its HTTP connection pool (and TLS sessions) across requests.
+_clients: Dict[str, Any] = {}
+
+# Connection pool of the shared client (HTTP/2 multiplexes concurrent calls)
+HTTP_MAX_CONNECTIONS = 64
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 32
+# Responses are always streamed, so the read timeout bounds the gap between
+# events rather than the whole generation
+HTTP_CONNECT_TIMEOUT = 10.0
+HTTP_READ_TIMEOUT = 60.0
+
+
+def get_client(api_key: str):
+    """Return the shared Anthropic client for `api_key`."""
+    client = _clients.get(api_key)
+    if client is None:
+        import anthropic
+        import httpx
+
+        _clients.clear()  # Drop clients for rotated keys
+        client = _clients[api_key] = anthropic.Anthropic(
+            api_key=api_key,
+            http_client=anthropic.DefaultHttpxClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+                timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            ),
+        )
+    return client
+
+
+@dataclass(slots=True, frozen=True)
+class ClaudeResult:
+    """Result of a ClaudeService generation."""
+    success: bool
+    content: Optional[str]
+    tokens_used: int
+    processing_time_ms: int
+    error: Optional[str] = None
+    usage: Optional[Dict[str, int]] = None  # Token breakdown incl. prompt cache
+    data: Optional[Dict[str, Any]] = None  # Tool input when json_schema is given
+
+
+def consume_stream(stream: Generator[str, None, ClaudeResult]) -> ClaudeResult:
+    """Run a generate_stream()-style generator to completion and return its result."""
+    while True:
+        try:
+            next(stream)
+        except StopIteration as stop:
+            return stop.value
+
+
 class ClaudeService:
     """
     Service for interacting with Claude AI API.
@@ -23,6 +83,8 @@ class ClaudeService:
     """
 
     DEFAULT_MODEL = "claude-sonnet-4-5-20250929"
+    # Faster, cheaper model for short/simple prompts (model_tier='fast')
+    FAST_MODEL = "claude-haiku-4-5-20251001"
     MAX_TOKENS = 4096
 
     def __init__(self):
@@ -48,11 +110,11 @@ class ClaudeService:
             from apps.core.models import PlatformSettings
             api_key = PlatformSettings.get_anthropic_key()
             if api_key:
-                self.client = anthropic.Anthropic(api_key=api_key)
+                self.client = get_client(api_key)
             else:
                 self.client = None
         except Exception as e:
-            logger.warning(f"Failed to initialize Claude client: {e}")
+            logger.warning("Failed to initialize Claude client: %s", e)
             self.client = None
 
     def is_available(self) -> bool:
@@ -65,9 +127,8 @@ class ClaudeService:
             from apps.core.models import PlatformSettings
             if not PlatformSettings.is_ai_enabled():
                 return False
-            # Reinitialize if client is None
-            if self.client is None:
-                self._initialize_client()
+            # Pick up the client for the current key (cheap when unchanged)
+            self._initialize_client()
             return self.client is not None
         except Exception:
             return False
@@ -78,8 +139,11 @@ class ClaudeService:
         system_prompt: Optional[str] = None,
         model: Optional[str] = None,
         max_tokens: Optional[int] = None,
-        temperature: float = 0.7
-    ) -> Dict[str, Any]:
+        temperature: float = 0.7,
+        model_tier: str = 'smart',
+        json_schema: Optional[Dict[str, Any]] = None,
+        json_schema_name: str = 'respond'
+    ) -> ClaudeResult:
         """
         Generate a response from Claude.
 
@@ -89,26 +153,70 @@ class ClaudeService:
             model: Model to use (defaults to configured model from settings)
             max_tokens: Maximum tokens in response
             temperature: Temperature for generation (0-1)
+            model_tier: 'smart' (configured model) or 'fast' (FAST_MODEL);
+                ignored when `model` is given
+            json_schema: Optional JSON schema; forces Claude to answer through
+                a tool with this input schema, so the response is valid JSON
+            json_schema_name: Name of that tool
 
         Returns:
-            Dict with 'success', 'content', 'tokens_used', 'processing_time_ms', 'error'
+            ClaudeResult; on success `usage` holds the token breakdown
+            including prompt-cache tokens, and with json_schema `data` holds
+            the parsed response object.
+        """
+        stream = self.generate_stream(
+            prompt,
+            system_prompt=system_prompt,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            model_tier=model_tier,
+            json_schema=json_schema,
+            json_schema_name=json_schema_name,
+        )
+        return consume_stream(stream)
+
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.7,
+        model_tier: str = 'smart',
+        json_schema: Optional[Dict[str, Any]] = None,
+        json_schema_name: str = 'respond'
+    ) -> Generator[str, None, ClaudeResult]:
+        """
+        Stream a response from Claude.
+
+        Yields text deltas (partial JSON with json_schema) as they arrive and
+        returns (via StopIteration.value, or `result = yield from ...`) the
+        same ClaudeResult as generate().
         """
         if not self.is_available():
-            return {
-                'success': False,
-                'content': None,
-                'tokens_used': 0,
-                'processing_time_ms': 0,
-                'error': 'Claude service is not available. Please check API key configuration.'
-            }
+            return ClaudeResult(
+                success=False,
+                content=None,
+                tokens_used=0,
+                processing_time_ms=0,
+                error='Claude service is not available. Please check API key configuration.'
+            )
+
+        import anthropic
 
         start_time = time.time()
 
         try:
             messages = [{"role": "user", "content": prompt}]
 
-            # Use provided model, or get configured model from settings
-            selected_model = model or self.get_configured_model()
+            # Use provided model, else the fast model or the configured model
+            if model:
+                selected_model = model
+            elif model_tier == 'fast':
+                selected_model = self.FAST_MODEL
+            else:
+                selected_model = self.get_configured_model()
 
             kwargs = {
                 "model": selected_model,
@@ -117,64 +225,102 @@ class ClaudeService:
             }
 
             if system_prompt:
-                kwargs["system"] = system_prompt
+                # System prompts are static per feature, so cache them as a prefix
+                kwargs["system"] = [{
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }]
+
+            if json_schema:
+                kwargs["tools"] = [{
+                    "name": json_schema_name,
+                    "description": "Submit the response.",
+                    "input_schema": json_schema,
+                }]
+                kwargs["tool_choice"] = {"type": "tool", "name": json_schema_name}
 
-            response = self.client.messages.create(**kwargs)
+            with self.client.messages.stream(**kwargs) as stream:
+                for event in stream:
+                    if event.type == 'text':
+                        yield event.text
+                    elif event.type == 'input_json':
+                        yield event.partial_json
+                response = stream.get_final_message()
 
             processing_time = int((time.time() - start_time) * 1000)
 
-            # Extract content
+            # Extract content (tool input is already a parsed dict)
             content = ""
-            if response.content:
-                content = response.content[0].text
-
-            # Calculate tokens
-            tokens_used = response.usage.input_tokens + response.usage.output_tokens
-
-            return {
-                'success': True,
-                'content': content,
-                'tokens_used': tokens_used,
-                'processing_time_ms': processing_time,
-                'error': None
+            data = None
+            for block in response.content:
+                if block.type == 'tool_use':
+                    data = block.input
+                    content = orjson.dumps(data).decode()
+                    break
+                if block.type == 'text':
+                    content += block.text
+
+            # Calculate tokens (input_tokens excludes prompt-cache reads/writes)
+            usage = {
+                'input_tokens': response.usage.input_tokens,
+                'output_tokens': response.usage.output_tokens,
+                'cache_creation_input_tokens': getattr(response.usage, 'cache_creation_input_tokens', None) or 0,
+                'cache_read_input_tokens': getattr(response.usage, 'cache_read_input_tokens', None) or 0,
             }
+            tokens_used = sum(usage.values())
+
+            return ClaudeResult(
+                success=True,
+                content=content,
+                tokens_used=tokens_used,
+                processing_time_ms=processing_time,
+                usage=usage,
+                data=data,
+            )
 
         except anthropic.APIConnectionError as e:
-            logger.error(f"Claude API connection error: {e}")
-            return {
-                'success': False,
-                'content': None,
-                'tokens_used': 0,
-                'processing_time_ms': int((time.time() - start_time) * 1000),
-                'error': 'Failed to connect to AI service. Please try again later.'
-            }
+            logger.error("Claude API connection error: %s", e)
+            return ClaudeResult(
+                success=False,
+                content=None,
+                tokens_used=0,
+                processing_time_ms=int((time.time() - start_time) * 1000),
+                error='Failed to connect to AI service. Please try again later.'
+            )
 
         except anthropic.RateLimitError as e:
-            logger.error(f"Claude API rate limit: {e}")
-            return {
-                'success': False,
-                'content': None,
-                'tokens_used': 0,
-                'processing_time_ms': int((time.time() - start_time) * 1000),
-                'error': 'AI service rate limit reached. Please try again in a few minutes.'
-            }
+            logger.error("Claude API rate limit: %s", e)
+            return ClaudeResult(
+                success=False,
+                content=None,
+                tokens_used=0,
+                processing_time_ms=int((time.time() - start_time) * 1000),
+                error='AI service rate limit reached. Please try again in a few minutes.'
+            )
 
         except anthropic.APIStatusError as e:
-            logger.error(f"Claude API status error: {e}")
-            return {
-                'success': False,
-                'content': None,
-                'tokens_used': 0,
-                'processing_time_ms': int((time.time() - start_time) * 1000),
-                'error': f'AI service error: {str(e)}'
-            }
+            logger.error("Claude API status error: %s", e)
+            return ClaudeResult(
+                success=False,
+                content=None,
+                tokens_used=0,
+                processing_time_ms=int((time.time() - start_time) * 1000),
+                error=f'AI service error: {str(e)}'
+            )
 
         except Exception as e:
-            logger.exception(f"Unexpected error in Claude service: {e}")
-            return {
-                'success': False,
-                'content': None,
-                'tokens_used': 0,
-                'processing_time_ms': int((time.time() - start_time) * 1000),
-                'error': 'An unexpected error occurred. Please try again.'
-            }
+            logger.exception("Unexpected error in Claude service: %s", e)
+            return ClaudeResult(
+                success=False,
+                content=None,
+                tokens_used=0,
+                processing_time_ms=int((time.time() - start_time) * 1000),
+                error='An unexpected error occurred. Please try again.'
+            )
+
+
+@lru_cache(maxsize=1)
+def get_claude_service() -> ClaudeService:
+    """Return the process-wide ClaudeService."""
+    return ClaudeService()
@@ -0,0 +1,25 @@
+"""
+Cache for the consultant experience summary used in proposal prompts.
+"""
+from django.core.cache import cache
+
+
+class ConsultantExperienceCache:
+    """Per-consultant cache of the recent completed-project titles text."""
+
+    TIMEOUT = 3600  # seconds
+    VERSION = 'v1'  # Bump when the cached text format changes
+
+    @classmethod
+    def get_key(cls, consultant_id):
+        return f'consultant:{consultant_id}:exp:{cls.VERSION}'
+
+    @classmethod
+    def get_or_set(cls, consultant_id, default):
+        """Return the cached text (may be None), building it with `default()` on a miss."""
+        return cache.get_or_set(cls.get_key(consultant_id), default, timeout=cls.TIMEOUT)
+
+    @classmethod
+    def invalidate(cls, consultant_id):
+        """Drop the cached text for a consultant."""
+        cache.delete(cls.get_key(consultant_id))
@@ -0,0 +1,163 @@
+"""
+Shared runner for AI generations (request cycle and Celery).
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from apps.ai.models import AIGeneration, AIUsageLimit
+from .inflight import AIInflightGauge
+from .proposal_generator import ProposalGeneratorService
+from .scope_generator import ScopeGeneratorService
+from .usage_counter import AIUsageCounter
+
+GenerationType = AIGeneration.GenerationType
+
+# Service class and method that produce each generation type
+GENERATION_RUNNERS = {
+    GenerationType.SCOPE_GENERATE: (ScopeGeneratorService, 'generate_scope'),
+    GenerationType.SCOPE_REFINE: (ScopeGeneratorService, 'refine_scope'),
+    GenerationType.DELIVERABLES: (ScopeGeneratorService, 'generate_deliverables'),
+    GenerationType.PROPOSAL: (ProposalGeneratorService, 'generate_proposal'),
+}
+
+# Result fields returned to the client for each generation type
+RESPONSE_FIELDS = {
+    GenerationType.SCOPE_GENERATE: (
+        'title', 'description', 'scope', 'budget_min', 'budget_max',
+        'estimated_duration_days', 'budget_reasoning',
+    ),
+    GenerationType.SCOPE_REFINE: ('refined_scope',),
+    GenerationType.DELIVERABLES: ('deliverables',),
+    GenerationType.PROPOSAL: (
+        'proposal', 'estimated_duration_days', 'estimated_amount', 'estimation_reasoning',
+    ),
+}
+
+# Result field stored as the AIGeneration output for each generation type
+OUTPUT_FIELDS = {
+    GenerationType.SCOPE_GENERATE: 'scope',
+    GenerationType.SCOPE_REFINE: 'refined_scope',
+    GenerationType.DELIVERABLES: 'deliverables',
+    GenerationType.PROPOSAL: 'proposal',
+}
+
+
+class AIGenerationService:
+    """Run AI generations, record their usage and keep results for polling."""
+
+    RESULT_TIMEOUT = 86400  # seconds
+
+    @staticmethod
+    def run(generation_type, kwargs):
+        """Run the generator for `generation_type` and return its result dict."""
+        service_class, method = GENERATION_RUNNERS[generation_type]
+        with AIInflightGauge.track():
+            return getattr(service_class(), method)(**kwargs)
+
+    @staticmethod
+    def get_response_data(generation_type, result):
+        """Return the client payload for a successful result."""
+        data = {field: result.get(field) for field in RESPONSE_FIELDS[generation_type]}
+        data['tokens_used'] = result['tokens_used']
+        data['processing_time_ms'] = result['processing_time_ms']
+        return data
+
+    @staticmethod
+    def get_result_key(generation_id):
+        return f'ai:generation:{generation_id}:result'
+
+    @classmethod
+    def set_result(cls, generation_id, data):
+        cache.set(cls.get_result_key(generation_id), data, timeout=cls.RESULT_TIMEOUT)
+
+    @classmethod
+    def get_result(cls, generation_id):
+        return cache.get(cls.get_result_key(generation_id))
+
+    @staticmethod
+    def _charge(user, used=1, generations=1, tokens=0):
+        """
+        Apply usage deltas to the user's limits in a single UPDATE.
+        `used` counts toward the daily/monthly limits (negative releases).
+        """
+        now = timezone.now()
+        # Single atomic UPDATE so concurrent requests don't lose increments
+        updated = AIUsageLimit.objects.filter(user=user).update(
+            daily_used=Greatest(F('daily_used') + used, 0),
+            monthly_used=Greatest(F('monthly_used') + used, 0),
+            total_generations=F('total_generations') + generations,
+            total_tokens_used=F('total_tokens_used') + tokens,
+            daily_reset_at=Coalesce('daily_reset_at', now),
+            monthly_reset_at=Coalesce('monthly_reset_at', now),
+            updated_at=now,
+        )
+        if not updated:
+            AIUsageLimit.objects.get_or_create(
+                user=user,
+                defaults={
+                    'daily_used': max(used, 0),
+                    'monthly_used': max(used, 0),
+                    'total_generations': generations,
+                    'total_tokens_used': tokens,
+                    'daily_reset_at': now,
+                    'monthly_reset_at': now,
+                },
+            )
+        if used:
+            transaction.on_commit(lambda: AIUsageCounter.increment(user.pk, used))
+
+    @classmethod
+    def reserve_usage(cls, user):
+        """Take one generation from the user's limits for a queued generation."""
+        cls._charge(user, used=1, generations=0)
+
+    @classmethod
+    def record_usage(cls, user, generation_type, input_text, result, project=None, proposal=None,
+                     generation=None, count_usage=None, reserved=False):
+        """
+        Record AI generation usage. Completes `generation` if given
+        (queued generations), otherwise creates the AIGeneration row.
+        `count_usage` (default: the result succeeded) charges the
+        generation to the user's limits; with `reserved` the limits were
+        already charged by reserve_usage() and a failure releases them.
+        """
+        if count_usage is None:
+            count_usage = result['success']
+
+        fields = {
+            'status': AIGeneration.Status.COMPLETED if result['success'] else AIGeneration.Status.FAILED,
+            'output_text': result.get(OUTPUT_FIELDS[generation_type]),
+            'tokens_used': result.get('tokens_used', 0),
+            'processing_time_ms': result.get('processing_time_ms', 0),
+            'error_message': result.get('error'),
+            'completed_at': timezone.now() if result['success'] else None,
+        }
+        # The row and the counters are written in a single commit
+        with transaction.atomic():
+            if generation is None:
+                generation = AIGeneration.objects.create(
+                    user=user,
+                    generation_type=generation_type,
+                    input_text=input_text[:1000],  # Truncate for storage
+                    project=project,
+                    proposal=proposal,
+                    **fields,
+                )
+            else:
+                for name, value in fields.items():
+                    setattr(generation, name, value)
+                generation.save()
+
+            # Update usage limits
+            if reserved:
+                if result['success']:
+                    cls._charge(user, used=0, tokens=result.get('tokens_used', 0))
+                else:
+                    cls._charge(user, used=-1, generations=0)
+            elif count_usage:
+                cls._charge(user, tokens=result.get('tokens_used', 0))
+
+        return generation
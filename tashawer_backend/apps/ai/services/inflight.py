@@ -0,0 +1,45 @@
+"""
+Global gauge of in-flight AI generations for load shedding.
+"""
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class AIInflightGauge:
+    """
+    Number of AI generations currently calling the model, across all
+    web and Celery workers. New generations are shed while it is at
+    AI_MAX_INFLIGHT_GENERATIONS.
+    """
+
+    KEY = 'ai:inflight'
+    TIMEOUT = 300  # seconds; bounds drift from workers that died mid-call
+
+    @classmethod
+    def get(cls):
+        # Can dip below zero when the key expired mid-call
+        return max(0, cache.get(cls.KEY, 0))
+
+    @classmethod
+    def is_overloaded(cls, count=1):
+        """True if starting `count` more generations would exceed the cap."""
+        return cls.get() + count > settings.AI_MAX_INFLIGHT_GENERATIONS
+
+    @classmethod
+    @contextmanager
+    def track(cls, count=1):
+        """Count `count` generations as in flight for the duration of the block."""
+        cache.add(cls.KEY, 0, timeout=cls.TIMEOUT)
+        try:
+            cache.incr(cls.KEY, count)
+        except ValueError:
+            pass  # Expired between add() and incr()
+        try:
+            yield
+        finally:
+            try:
+                cache.decr(cls.KEY, count)
+            except ValueError:
+                pass
@@ -2,31 +2,96 @@
 PDF generation service for proposals.
 """
 
+import importlib.util
 import io
 import logging
+import os
+import re
 from datetime import datetime
 from typing import Optional, Dict, Any
 
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.http.response import HttpResponseBase
 
 logger = logging.getLogger(__name__)
 
-try:
+# ReportLab is imported by _load_reportlab() on the first render; its import
+# graph is heavy and most workers never build a PDF
+REPORTLAB_AVAILABLE = importlib.util.find_spec('reportlab') is not None
+if not REPORTLAB_AVAILABLE:
+    logger.warning("ReportLab not installed. PDF generation will not work.")
+
+_reportlab_loaded = False
+
+# Arabic-capable TTF fonts (font name -> file in settings.PDF_FONT_DIR)
+ARABIC_FONT_FILES = {
+    'Amiri': 'Amiri-Regular.ttf',
+    'Amiri-Bold': 'Amiri-Bold.ttf',
+}
+
+# Fonts used by the paragraph styles; switched to Amiri once it is registered
+FONT_NAME = 'Helvetica'
+BOLD_FONT_NAME = 'Helvetica-Bold'
+
+
+def _load_reportlab():
+    """
+    Import the ReportLab names used below into module globals and register
+    the Arabic fonts (once per process; TTF parsing is slow).
+    """
+    global _reportlab_loaded, colors, A4, getSampleStyleSheet, ParagraphStyle, cm
+    global SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    global TA_RIGHT, TA_CENTER, TA_LEFT
+    global FONT_NAME, BOLD_FONT_NAME
+    if _reportlab_loaded:
+        return
+
     from reportlab.lib import colors
     from reportlab.lib.pagesizes import A4
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.units import cm
     from reportlab.platypus import (
         SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
-        PageBreak, Image
     )
+    from reportlab.lib.enums import TA_RIGHT, TA_CENTER, TA_LEFT
     from reportlab.pdfbase import pdfmetrics
     from reportlab.pdfbase.ttfonts import TTFont
-    from reportlab.lib.enums import TA_RIGHT, TA_CENTER, TA_LEFT
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
-    logger.warning("ReportLab not installed. PDF generation will not work.")
+
+    font_paths = {
+        name: os.path.join(settings.PDF_FONT_DIR, filename)
+        for name, filename in ARABIC_FONT_FILES.items()
+    }
+    if all(os.path.exists(path) for path in font_paths.values()):
+        for name, path in font_paths.items():
+            pdfmetrics.registerFont(TTFont(name, path))
+        # Map <b> markup in Amiri paragraphs to the bold face
+        pdfmetrics.registerFontFamily(
+            'Amiri', normal='Amiri', bold='Amiri-Bold', italic='Amiri', boldItalic='Amiri-Bold'
+        )
+        FONT_NAME, BOLD_FONT_NAME = 'Amiri', 'Amiri-Bold'
+    else:
+        logger.warning(
+            "Amiri fonts not found in %s. PDFs will use Helvetica, which has no Arabic glyphs.",
+            settings.PDF_FONT_DIR,
+        )
+    _reportlab_loaded = True
+
+
+# One line of the simple Markdown subset: optional heading/bullet marker + text
+MARKDOWN_LINE_RE = re.compile(r'^(?:(?P<marker>###|##|#|[-*]) )?(?P<text>.*)$')
+
+# Marker -> (style name, text prefix)
+MARKDOWN_LINE_STYLES = {
+    '#': ('title', ''),
+    '##': ('heading', ''),
+    '###': ('subheading', ''),
+    '-': ('body', '• '),
+    '*': ('body', '• '),
+    None: ('body', ''),
+}
+
+HTML_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
 
 
 class PDFGeneratorService:
@@ -34,12 +99,16 @@ class PDFGeneratorService:
     Service for generating professional PDF documents.
     """
 
-    # Tashawer brand colors
-    PRIMARY_COLOR = colors.HexColor('#10B981')  # Green
-    SECONDARY_COLOR = colors.HexColor('#1F2937')  # Dark gray
-    ACCENT_COLOR = colors.HexColor('#059669')  # Darker green
-    TEXT_COLOR = colors.HexColor('#374151')
-    LIGHT_GRAY = colors.HexColor('#F3F4F6')
+    # Tashawer brand colors (hex; converted with colors.HexColor when used)
+    PRIMARY_COLOR = '#10B981'  # Green
+    SECONDARY_COLOR = '#1F2937'  # Dark gray
+    ACCENT_COLOR = '#059669'  # Darker green
+    TEXT_COLOR = '#374151'
+    LIGHT_GRAY = '#F3F4F6'
+
+    # Paragraph and table styles per is_rtl, built once and shared
+    _styles_cache: Dict[bool, Dict[str, Any]] = {}
+    _meta_table_style_cache: Dict[bool, Any] = {}
 
     def __init__(self):
         self.available = REPORTLAB_AVAILABLE
@@ -48,7 +117,29 @@ class PDFGeneratorService:
         return self.available
 
     def _get_styles(self, is_rtl: bool = True):
-        """Get configured paragraph styles."""
+        """Get configured paragraph styles (cached per direction)."""
+        styles = self._styles_cache.get(is_rtl)
+        if styles is None:
+            styles = self._styles_cache[is_rtl] = self._build_styles(is_rtl)
+        return styles
+
+    def _get_meta_table_style(self, is_rtl: bool = True):
+        """Get the meta info table style (cached per direction)."""
+        table_style = self._meta_table_style_cache.get(is_rtl)
+        if table_style is None:
+            table_style = self._meta_table_style_cache[is_rtl] = TableStyle([
+                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor(self.LIGHT_GRAY)),
+                ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor(self.SECONDARY_COLOR)),
+                ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
+                ('FONTSIZE', (0, 0), (-1, -1), 11),
+                ('PADDING', (0, 0), (-1, -1), 8),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('ALIGN', (0, 0), (-1, -1), 'RIGHT' if is_rtl else 'LEFT'),
+            ])
+        return table_style
+
+    def _build_styles(self, is_rtl: bool = True):
+        """Build configured paragraph styles."""
         styles = getSampleStyleSheet()
 
         alignment = TA_RIGHT if is_rtl else TA_LEFT
@@ -57,8 +148,9 @@ class PDFGeneratorService:
         title_style = ParagraphStyle(
             'ProposalTitle',
             parent=styles['Heading1'],
+            fontName=BOLD_FONT_NAME,
             fontSize=24,
-            textColor=self.SECONDARY_COLOR,
+            textColor=colors.HexColor(self.SECONDARY_COLOR),
             spaceAfter=20,
             alignment=TA_CENTER,
         )
@@ -66,8 +158,9 @@ class PDFGeneratorService:
         heading_style = ParagraphStyle(
             'ProposalHeading',
             parent=styles['Heading2'],
+            fontName=BOLD_FONT_NAME,
             fontSize=16,
-            textColor=self.PRIMARY_COLOR,
+            textColor=colors.HexColor(self.PRIMARY_COLOR),
             spaceAfter=12,
             spaceBefore=20,
             alignment=alignment,
@@ -76,8 +169,9 @@ class PDFGeneratorService:
         subheading_style = ParagraphStyle(
             'ProposalSubheading',
             parent=styles['Heading3'],
+            fontName=BOLD_FONT_NAME,
             fontSize=14,
-            textColor=self.SECONDARY_COLOR,
+            textColor=colors.HexColor(self.SECONDARY_COLOR),
             spaceAfter=8,
             alignment=alignment,
         )
@@ -85,8 +179,9 @@ class PDFGeneratorService:
         body_style = ParagraphStyle(
             'ProposalBody',
             parent=styles['Normal'],
+            fontName=FONT_NAME,
             fontSize=11,
-            textColor=self.TEXT_COLOR,
+            textColor=colors.HexColor(self.TEXT_COLOR),
             spaceAfter=8,
             alignment=alignment,
             leading=16,
@@ -95,6 +190,7 @@ class PDFGeneratorService:
         footer_style = ParagraphStyle(
             'ProposalFooter',
             parent=styles['Normal'],
+            fontName=FONT_NAME,
             fontSize=9,
             textColor=colors.grey,
             alignment=TA_CENTER,
@@ -116,7 +212,7 @@ class PDFGeneratorService:
         proposed_amount: Optional[str] = None,
         currency: str = 'SAR',
         is_rtl: bool = True,
-    ) -> HttpResponse:
+    ) -> HttpResponseBase:
         """
         Generate a PDF document for a proposal.
 
@@ -138,6 +234,43 @@ class PDFGeneratorService:
                 status=500
             )
 
+        buffer = self.build_proposal_pdf(
+            proposal_content=proposal_content,
+            project_title=project_title,
+            consultant_name=consultant_name,
+            proposed_amount=proposed_amount,
+            currency=currency,
+            is_rtl=is_rtl,
+        )
+
+        # Stream the buffer rather than copying it into the response
+        return FileResponse(
+            buffer,
+            content_type='application/pdf',
+            as_attachment=True,
+            filename=self.get_filename(),
+        )
+
+    @staticmethod
+    def get_filename() -> str:
+        return f"proposal_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+
+    def build_proposal_pdf(
+        self,
+        proposal_content: str,
+        project_title: str,
+        consultant_name: str,
+        proposed_amount: Optional[str] = None,
+        currency: str = 'SAR',
+        is_rtl: bool = True,
+    ) -> io.BytesIO:
+        """
+        Render a proposal PDF (requires reportlab).
+
+        Returns:
+            Buffer with the PDF, positioned at the start
+        """
+        _load_reportlab()
         buffer = io.BytesIO()
         styles = self._get_styles(is_rtl)
 
@@ -168,46 +301,20 @@ class PDFGeneratorService:
             meta_data.append(['السعر / Price:', f"{proposed_amount} {currency}"])
 
         meta_table = Table(meta_data, colWidths=[4*cm, 12*cm])
-        meta_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), self.LIGHT_GRAY),
-            ('TEXTCOLOR', (0, 0), (0, -1), self.SECONDARY_COLOR),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('PADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ALIGN', (0, 0), (-1, -1), 'RIGHT' if is_rtl else 'LEFT'),
-        ]))
+        meta_table.setStyle(self._get_meta_table_style(is_rtl))
         content.append(meta_table)
         content.append(Spacer(1, 30))
 
         # Parse proposal content (simple Markdown parsing)
-        lines = proposal_content.split('\n')
-        for line in lines:
-            line = line.strip()
-            if not line:
+        for line in proposal_content.split('\n'):
+            match = MARKDOWN_LINE_RE.match(line.strip())
+            marker, text = match.group('marker'), match.group('text').strip()
+            if not marker and not text:
                 content.append(Spacer(1, 8))
                 continue
 
-            # Headers
-            if line.startswith('## '):
-                text = line[3:].strip()
-                content.append(Paragraph(self._escape_html(text), styles['heading']))
-            elif line.startswith('### '):
-                text = line[4:].strip()
-                content.append(Paragraph(self._escape_html(text), styles['subheading']))
-            elif line.startswith('# '):
-                text = line[2:].strip()
-                content.append(Paragraph(self._escape_html(text), styles['title']))
-            elif line.startswith('- '):
-                text = line[2:].strip()
-                bullet = '•' if not is_rtl else '•'
-                content.append(Paragraph(f"{bullet} {self._escape_html(text)}", styles['body']))
-            elif line.startswith('* '):
-                text = line[2:].strip()
-                bullet = '•'
-                content.append(Paragraph(f"{bullet} {self._escape_html(text)}", styles['body']))
-            else:
-                # Regular paragraph
-                content.append(Paragraph(self._escape_html(line), styles['body']))
+            style, prefix = MARKDOWN_LINE_STYLES[marker]
+            content.append(Paragraph(prefix + self._escape_html(text), styles[style]))
 
         # Footer
         content.append(Spacer(1, 40))
@@ -223,21 +330,14 @@ class PDFGeneratorService:
         # Build PDF
         doc.build(content)
 
-        # Create response
         buffer.seek(0)
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-        filename = f"proposal_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-        return response
+        return buffer
 
     def _escape_html(self, text: str) -> str:
         """Escape HTML special characters for ReportLab."""
         return (
             text
-            .replace('&', '&amp;')
-            .replace('<', '&lt;')
-            .replace('>', '&gt;')
+            .translate(HTML_ESCAPE_TABLE)
             .replace('**', '')  # Remove markdown bold
             .replace('__', '')  # Remove markdown underline
         )
@@ -246,7 +346,7 @@ class PDFGeneratorService:
         self,
         proposal_instance,
         proposal_content: str,
-    ) -> HttpResponse:
+    ) -> HttpResponseBase:
         """
         Generate PDF from a Proposal model instance.
 
@@ -0,0 +1,57 @@
+"""
+Cache-backed store for proposal PDFs rendered in the background.
+"""
+import uuid
+
+from django.core.cache import cache
+
+
+class ProposalPDFJobs:
+    """
+    Status and output of queued proposal PDF renders, keyed by job id.
+    The rendered PDF is kept in the cache until it expires; jobs are only
+    visible to the user who queued them.
+    """
+
+    TIMEOUT = 3600  # seconds
+
+    class Status:
+        PENDING = 'pending'
+        COMPLETED = 'completed'
+        FAILED = 'failed'
+
+    @staticmethod
+    def get_key(job_id):
+        return f'ai:pdf:{job_id}'
+
+    @classmethod
+    def create(cls, user_id):
+        """Register a pending job for `user_id` and return its id."""
+        job_id = str(uuid.uuid4())
+        cls._set(job_id, {'user_id': str(user_id), 'status': cls.Status.PENDING})
+        return job_id
+
+    @classmethod
+    def complete(cls, job_id, user_id, filename, content):
+        cls._set(job_id, {
+            'user_id': str(user_id),
+            'status': cls.Status.COMPLETED,
+            'filename': filename,
+            'content': content,
+        })
+
+    @classmethod
+    def fail(cls, job_id, user_id, error):
+        cls._set(job_id, {'user_id': str(user_id), 'status': cls.Status.FAILED, 'error': error})
+
+    @classmethod
+    def get(cls, job_id, user_id):
+        """Return the job if it exists and belongs to `user_id`, else None."""
+        job = cache.get(cls.get_key(job_id))
+        if job is None or job['user_id'] != str(user_id):
+            return None
+        return job
+
+    @classmethod
+    def _set(cls, job_id, job):
+        cache.set(cls.get_key(job_id), job, timeout=cls.TIMEOUT)
@@ -2,56 +2,78 @@
 Proposal generation service using Claude AI.
 """
 
-import json
 import logging
-import re
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Generator, List, Optional
 from decimal import Decimal
 
-from .claude import ClaudeService
+import orjson
+from django.db import connections
+
+from .claude import ClaudeResult, get_claude_service
+from .experience_cache import ConsultantExperienceCache
+from .response_cache import AIResponseCache
 from apps.ai.prompts.proposal import (
     PROPOSAL_SYSTEM_AR,
     PROPOSAL_SYSTEM_EN,
-    PROPOSAL_USER_AR,
-    PROPOSAL_USER_EN,
+    PROPOSAL_USER_AR_TEMPLATE,
+    PROPOSAL_USER_EN_TEMPLATE,
+    PROPOSAL_RESPONSE_SCHEMA,
+    PROPOSAL_LABELS_AR,
+    PROPOSAL_LABELS_EN,
 )
 
 logger = logging.getLogger(__name__)
 
 
+def truncate_text(text: Optional[str], max_chars: int) -> Optional[str]:
+    """Cut `text` to at most `max_chars`, at a word boundary where possible."""
+    if not text or len(text) <= max_chars:
+        return text
+    cut = text[:max_chars - 1]
+    space = cut.rfind(' ')
+    if space > max_chars // 2:
+        cut = cut[:space]
+    return cut.rstrip() + '…'
+
+
 class ProposalGeneratorService:
     """
     Service for generating professional proposals using AI.
     """
 
+    # Scopes shorter than this (with no experience details) use the fast model
+    FAST_SCOPE_MAX_LENGTH = 1500
+    # Upper bound on proposals generated concurrently by generate_many()
+    MAX_BATCH_SIZE = 16
+    # Response cache namespace; bump the version when the prompts change
+    CACHE_NAMESPACE = 'proposal:v1'
+    # Prompt input caps (~4 chars per token: ~1500 / 300 / 150 tokens)
+    SCOPE_MAX_CHARS = 6000
+    EXPERIENCE_MAX_CHARS = 1200
+    BIO_MAX_CHARS = 600
+
     def __init__(self):
-        self.claude = ClaudeService()
+        self.claude = get_claude_service()
 
     def _parse_json_response(self, content: str) -> Dict[str, Any]:
         """
-        Parse JSON response from Claude, handling potential formatting issues.
+        Parse a JSON proposal from plain response text (fallback when the
+        structured tool response is missing).
         """
-        try:
-            # Try direct JSON parsing first
-            return json.loads(content)
-        except json.JSONDecodeError:
-            pass
-
-        # Try to extract JSON from markdown code blocks
-        json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', content, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group(1))
-            except json.JSONDecodeError:
-                pass
+        # Whole content first, then the outermost {...} (strips prose/code fences)
+        start, end = content.find('{'), content.rfind('}')
+        candidates = [content]
+        if start != -1 and end > start:
+            candidates.append(content[start:end + 1])
 
-        # Try to find JSON object in the content
-        json_match = re.search(r'\{[^{}]*"cover_letter"[^{}]*\}', content, re.DOTALL)
-        if json_match:
+        for candidate in candidates:
             try:
-                return json.loads(json_match.group(0))
-            except json.JSONDecodeError:
-                pass
+                parsed = orjson.loads(candidate)
+            except orjson.JSONDecodeError:
+                continue
+            if isinstance(parsed, dict):
+                return parsed
 
         # If all parsing fails, return the content as cover_letter
         logger.warning("Failed to parse JSON response, using raw content as cover_letter")
@@ -93,53 +115,152 @@ class ProposalGeneratorService:
         Returns:
             Dict with 'success', 'proposal', 'estimated_duration_days',
             'estimated_amount', 'estimation_reasoning', 'tokens_used',
-            'processing_time_ms', 'error'
+            'processing_time_ms', 'error' (plus 'cache_hit' when served from
+            the response cache)
         """
         if not self.claude.is_available():
-            return {
-                'success': False,
-                'proposal': None,
-                'estimated_duration_days': None,
-                'estimated_amount': None,
-                'estimation_reasoning': None,
-                'tokens_used': 0,
-                'processing_time_ms': 0,
-                'error': 'AI service is not available.'
-            }
+            return self._unavailable_result()
+
+        # Look up by the raw inputs; the prompt is only built on a miss
+        cache_key = AIResponseCache.get_input_key(
+            self.CACHE_NAMESPACE, project_title, project_scope, consultant_name,
+            consultant_bio, consultant_experience, proposed_amount, currency,
+            duration, additional_notes, language,
+        )
+
+        def generate():
+            system_prompt, user_prompt, model_tier = self._build_prompts(
+                project_title, project_scope, consultant_name, consultant_bio,
+                consultant_experience, proposed_amount, currency, duration,
+                additional_notes, language,
+            )
+            result = self.claude.generate(
+                prompt=user_prompt,
+                system_prompt=system_prompt,
+                temperature=0.7,
+                max_tokens=4000,
+                model_tier=model_tier,
+                json_schema=PROPOSAL_RESPONSE_SCHEMA,
+                json_schema_name='submit_proposal'
+            )
+            return self._build_result(result)
+
+        return AIResponseCache.get_or_generate(cache_key, generate)
+
+    def generate_proposal_stream(
+        self,
+        project_title: str,
+        project_scope: str,
+        consultant_name: str,
+        consultant_bio: Optional[str] = None,
+        consultant_experience: Optional[str] = None,
+        proposed_amount: Optional[Decimal] = None,
+        currency: str = 'SAR',
+        duration: Optional[str] = None,
+        additional_notes: Optional[str] = None,
+        language: str = 'ar',
+    ) -> Generator[str, None, Dict[str, Any]]:
+        """
+        Streaming variant of generate_proposal().
+        Yields raw response text as it arrives and returns the same dict
+        as generate_proposal() once the response is complete.
+        """
+        if not self.claude.is_available():
+            return self._unavailable_result()
+
+        system_prompt, user_prompt, model_tier = self._build_prompts(
+            project_title, project_scope, consultant_name, consultant_bio,
+            consultant_experience, proposed_amount, currency, duration,
+            additional_notes, language,
+        )
 
+        result = yield from self.claude.generate_stream(
+            prompt=user_prompt,
+            system_prompt=system_prompt,
+            temperature=0.7,
+            max_tokens=4000,
+            model_tier=model_tier,
+            json_schema=PROPOSAL_RESPONSE_SCHEMA,
+            json_schema_name='submit_proposal'
+        )
+        return self._build_result(result)
+
+    def generate_many(self, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Generate several proposals concurrently.
+
+        Args:
+            payloads: List of generate_proposal() keyword argument dicts
+                (at most MAX_BATCH_SIZE)
+
+        Returns:
+            List of generate_proposal() results, in payload order
+        """
+        if not self.claude.is_available():
+            return [self._unavailable_result() for _ in payloads]
+
+        def generate(payload):
+            try:
+                return self.generate_proposal(**payload)
+            finally:
+                # Worker threads get their own DB connections (settings lookup)
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=min(len(payloads), self.MAX_BATCH_SIZE) or 1) as executor:
+            return list(executor.map(generate, payloads))
+
+    @staticmethod
+    def _unavailable_result() -> Dict[str, Any]:
+        return {
+            'success': False,
+            'proposal': None,
+            'estimated_duration_days': None,
+            'estimated_amount': None,
+            'estimation_reasoning': None,
+            'tokens_used': 0,
+            'processing_time_ms': 0,
+            'error': 'AI service is not available.'
+        }
+
+    def _build_prompts(
+        self,
+        project_title, project_scope, consultant_name, consultant_bio,
+        consultant_experience, proposed_amount, currency, duration,
+        additional_notes, language,
+    ):
+        """Return (system_prompt, user_prompt, model_tier) for a proposal request."""
         # Select prompts based on language
         if language == 'ar':
             system_prompt = PROPOSAL_SYSTEM_AR
-            user_template = PROPOSAL_USER_AR
+            user_template = PROPOSAL_USER_AR_TEMPLATE
+            labels = PROPOSAL_LABELS_AR
         else:
             system_prompt = PROPOSAL_SYSTEM_EN
-            user_template = PROPOSAL_USER_EN
+            user_template = PROPOSAL_USER_EN_TEMPLATE
+            labels = PROPOSAL_LABELS_EN
 
-        # Build consultant bio section
-        bio_text = ""
-        if consultant_bio:
-            bio_text = f"Bio: {consultant_bio}" if language == 'en' else f"نبذة: {consultant_bio}"
+        # Short scopes without experience details don't need the larger model
+        is_simple = len(project_scope or '') < self.FAST_SCOPE_MAX_LENGTH and not consultant_experience
 
-        # Build experience section
-        experience_text = ""
-        if consultant_experience:
-            experience_text = f"Relevant Experience:\n{consultant_experience}" if language == 'en' else f"الخبرات ذات الصلة:\n{consultant_experience}"
+        # Input tokens dominate cost; the proposal doesn't need every detail
+        project_scope = truncate_text(project_scope, self.SCOPE_MAX_CHARS)
+        consultant_bio = truncate_text(consultant_bio, self.BIO_MAX_CHARS)
+        consultant_experience = truncate_text(consultant_experience, self.EXPERIENCE_MAX_CHARS)
+
+        # Optional sections, each prefixed with its constant label
+        bio_text = f"{labels['bio']}{consultant_bio}" if consultant_bio else ""
+        experience_text = f"{labels['experience']}{consultant_experience}" if consultant_experience else ""
 
-        # Build additional context
         additional_context_parts = []
         if proposed_amount:
-            hint = f"Client's budget hint: {proposed_amount} {currency}" if language == 'en' else f"تلميح ميزانية العميل: {proposed_amount} {currency}"
-            additional_context_parts.append(hint)
+            additional_context_parts.append(f"{labels['budget_hint']}{proposed_amount} {currency}")
         if duration:
-            hint = f"Duration hint from consultant: {duration}" if language == 'en' else f"تلميح المدة من المستشار: {duration}"
-            additional_context_parts.append(hint)
+            additional_context_parts.append(f"{labels['duration_hint']}{duration}")
         if additional_notes:
-            note = f"Additional Notes: {additional_notes}" if language == 'en' else f"ملاحظات إضافية: {additional_notes}"
-            additional_context_parts.append(note)
-
-        additional_context = "\n".join(additional_context_parts) if additional_context_parts else ""
+            additional_context_parts.append(f"{labels['notes']}{additional_notes}")
+        additional_context = "\n".join(additional_context_parts)
 
-        user_prompt = user_template.format(
+        user_prompt = user_template.render(
             project_title=project_title,
             project_scope=project_scope,
             consultant_name=consultant_name,
@@ -148,25 +269,23 @@ class ProposalGeneratorService:
             additional_context=additional_context,
         )
 
-        result = self.claude.generate(
-            prompt=user_prompt,
-            system_prompt=system_prompt,
-            temperature=0.7,
-            max_tokens=4000
-        )
+        return system_prompt, user_prompt, 'fast' if is_simple else 'smart'
 
-        if result['success']:
-            # Parse the JSON response
-            parsed = self._parse_json_response(result['content'])
+    def _build_result(self, result: ClaudeResult) -> Dict[str, Any]:
+        """Map a ClaudeService result to the proposal result dict."""
+        if result.success:
+            parsed = result.data
+            if not isinstance(parsed, dict):
+                parsed = self._parse_json_response(result.content)
 
             return {
                 'success': True,
-                'proposal': parsed.get('cover_letter', result['content']),
+                'proposal': parsed.get('cover_letter', result.content),
                 'estimated_duration_days': parsed.get('estimated_duration_days'),
                 'estimated_amount': parsed.get('estimated_amount'),
                 'estimation_reasoning': parsed.get('estimation_reasoning'),
-                'tokens_used': result['tokens_used'],
-                'processing_time_ms': result['processing_time_ms'],
+                'tokens_used': result.tokens_used,
+                'processing_time_ms': result.processing_time_ms,
                 'error': None
             }
         else:
@@ -176,9 +295,9 @@ class ProposalGeneratorService:
                 'estimated_duration_days': None,
                 'estimated_amount': None,
                 'estimation_reasoning': None,
-                'tokens_used': result['tokens_used'],
-                'processing_time_ms': result['processing_time_ms'],
-                'error': result['error']
+                'tokens_used': result.tokens_used,
+                'processing_time_ms': result.processing_time_ms,
+                'error': result.error
             }
 
     def generate_from_proposal(
@@ -202,19 +321,10 @@ class ProposalGeneratorService:
         # Get consultant bio and experience
         consultant_bio = getattr(consultant, 'bio', None)
 
-        # Get consultant experience from previous completed orders
-        experience_text = None
-        completed_orders = consultant.orders_as_consultant.filter(
-            status='completed'
-        ).select_related('project')[:5]
-
-        if completed_orders.exists():
-            experience_parts = []
-            for order in completed_orders:
-                if order.project:
-                    experience_parts.append(f"- {order.project.title}")
-            if experience_parts:
-                experience_text = "\n".join(experience_parts)
+        # Get consultant experience from the latest completed orders
+        experience_text = ConsultantExperienceCache.get_or_set(
+            consultant.pk, lambda: self._get_experience_text(consultant)
+        )
 
         return self.generate_proposal(
             project_title=project.title,
@@ -228,3 +338,13 @@ class ProposalGeneratorService:
             additional_notes=additional_notes,
             language='ar',
         )
+
+    @staticmethod
+    def _get_experience_text(consultant) -> Optional[str]:
+        """Bullet list of the consultant's latest completed project titles (one query)."""
+        completed_titles = list(
+            consultant.consultant_orders.filter(
+                status='completed', project__isnull=False
+            ).order_by('-completed_at').values_list('project__title', flat=True)[:5]
+        )
+        return "\n".join(f"- {title}" for title in completed_titles) if completed_titles else None
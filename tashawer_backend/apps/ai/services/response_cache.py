@@ -0,0 +1,122 @@
+"""
+Exact-match cache for AI responses, keyed on the normalized prompt.
+"""
+import hashlib
+import re
+import time
+import unicodedata
+from typing import Any, Callable, Dict, Optional
+
+from django.core.cache import cache
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+ARABIC_TATWEEL = '\u0640'
+
+
+def normalize_prompt(text: str) -> str:
+    """
+    Cache-key form of a prompt: NFC with surrounding whitespace stripped.
+    Case, diacritics and line structure are kept, since they carry through
+    to the generated text.
+    """
+    return unicodedata.normalize('NFC', text).strip()
+
+
+def canonicalize_prompt(text: str) -> str:
+    """
+    Reduce free text to a loose cache-key form: NFKD, without combining
+    marks (Arabic diacritics, accents) or tatweel, casefolded, with
+    whitespace collapsed. Only for inputs the output doesn't echo (scope
+    generation descriptions); Claude always gets the original text.
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(
+        char for char in decomposed
+        if not unicodedata.combining(char) and char != ARABIC_TATWEEL
+    )
+    return WHITESPACE_RE.sub(' ', stripped.casefold()).strip()
+
+
+class AIResponseCache:
+    """Successful generation results, reused for identical prompts."""
+
+    TIMEOUT = 86400  # seconds
+    # In-flight marker lifetime, in case its holder dies without releasing it
+    LOCK_TIMEOUT = 120  # seconds
+    # How long a duplicate request waits for the in-flight one
+    WAIT_TIMEOUT = 5  # seconds
+    WAIT_INTERVAL = 0.25  # seconds
+
+    @staticmethod
+    def get_key(namespace: str, system_prompt: str, user_prompt: str) -> str:
+        """Cache key from a SHA-256 of the normalized system + user prompt."""
+        digest = hashlib.sha256(
+            normalize_prompt(f"{system_prompt}\x1e{user_prompt}").encode()
+        ).hexdigest()
+        return f'ai:{namespace}:{digest}'
+
+    @staticmethod
+    def get_input_key(namespace: str, *values: Any) -> str:
+        """
+        Cache key from a BLAKE2b of the normalized generation inputs, so a
+        lookup doesn't need the prompt to be built first. Bump the namespace
+        version when the prompts change.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for value in values:
+            digest.update(normalize_prompt('' if value is None else str(value)).encode())
+            digest.update(b'\x1e')
+        return f'ai:{namespace}:{digest.hexdigest()}'
+
+    @staticmethod
+    def get(key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result (flagged, reported as free and instant), or None."""
+        cached = cache.get(key)
+        if cached is None:
+            return None
+        return {**cached, 'tokens_used': 0, 'processing_time_ms': 0, 'cache_hit': True}
+
+    @classmethod
+    def set(cls, key: str, result: Dict[str, Any]):
+        """Cache a result if the generation succeeded."""
+        if result['success']:
+            cache.set(key, result, timeout=cls.TIMEOUT)
+
+    @classmethod
+    def get_or_generate(cls, key: str, generate: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Return the cached result, or run `generate()` and cache it.
+        Identical requests arriving while a generation is in flight (double
+        submits, UI retries) wait up to WAIT_TIMEOUT for its result instead
+        of calling Claude again; after that they generate themselves.
+        """
+        cached = cls.get(key)
+        if cached is not None:
+            return cached
+
+        lock_key = f'{key}:lock'
+        deadline = time.monotonic() + cls.WAIT_TIMEOUT
+        # Waiters retry the lock rather than all generating once the holder
+        # finishes, so a failed generation is retried by one request at a time
+        while not cache.add(lock_key, True, timeout=cls.LOCK_TIMEOUT):
+            if time.monotonic() >= deadline:
+                # Don't hold the worker any longer; generate without the lock
+                result = generate()
+                cls.set(key, result)
+                return result
+            time.sleep(cls.WAIT_INTERVAL)
+            cached = cls.get(key)
+            if cached is not None:
+                return cached
+
+        try:
+            # The previous holder may have cached it just before we got the lock
+            cached = cls.get(key)
+            if cached is not None:
+                return cached
+            result = generate()
+            cls.set(key, result)
+        finally:
+            cache.delete(lock_key)
+        return result
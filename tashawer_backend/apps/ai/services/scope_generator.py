@@ -2,26 +2,65 @@
 Scope generation service using Claude AI.
 """
 
-import json
 import logging
 import re
 from typing import Dict, Any, Optional
+
+import orjson
 from django.utils import timezone
 
-from .claude import ClaudeService
+from .claude import get_claude_service
+from .response_cache import AIResponseCache, canonicalize_prompt
 from apps.ai.prompts.scope import (
     SCOPE_GENERATION_SYSTEM,
-    SCOPE_GENERATION_USER,
+    SCOPE_GENERATION_USER_TEMPLATE,
     SCOPE_REFINE_SYSTEM,
-    SCOPE_REFINE_USER,
+    SCOPE_REFINE_USER_TEMPLATE,
+    SCOPE_RESPONSE_SCHEMA,
+    SCOPE_CATEGORY_LABEL,
+    SCOPE_BUDGET_RANGE_LABEL,
+    SCOPE_REFINE_FOCUS_LABEL,
 )
 from apps.ai.prompts.deliverables import (
     DELIVERABLES_SYSTEM,
-    DELIVERABLES_USER,
+    DELIVERABLES_USER_TEMPLATE,
+    DELIVERABLES_REQUIREMENTS_LABEL,
 )
 
 logger = logging.getLogger(__name__)
 
+# Fallback for JSON wrapped in a Markdown code fence
+JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+
+# Tokens that matter when locating a JSON object: escapes, quotes and braces
+JSON_STRUCTURAL_RE = re.compile(r'\\.|[{}"]', re.DOTALL)
+
+
+def find_json_object(content: str) -> Optional[str]:
+    """
+    Return the first balanced {...} in `content`, or None.
+    Braces inside JSON strings are ignored; runs in one linear scan.
+    """
+    start = content.find('{')
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    for match in JSON_STRUCTURAL_RE.finditer(content, start):
+        token = match.group()
+        if token == '"':
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if depth == 0:
+                return content[start:match.end()]
+    return None
+
 
 class ScopeGeneratorService:
     """
@@ -29,7 +68,7 @@ class ScopeGeneratorService:
     """
 
     def __init__(self):
-        self.claude = ClaudeService()
+        self.claude = get_claude_service()
 
     def _parse_json_response(self, content: str) -> Dict[str, Any]:
         """
@@ -37,32 +76,24 @@ class ScopeGeneratorService:
         """
         try:
             # Try direct JSON parsing first
-            return json.loads(content)
-        except json.JSONDecodeError:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
             pass
 
         # Try to extract JSON from markdown code blocks
-        json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', content, re.DOTALL)
+        json_match = JSON_FENCE_RE.search(content)
         if json_match:
             try:
-                return json.loads(json_match.group(1))
-            except json.JSONDecodeError:
+                return orjson.loads(json_match.group(1))
+            except orjson.JSONDecodeError:
                 pass
 
-        # Try to find JSON object in the content
-        json_match = re.search(r'\{[^{}]*"title"[^{}]*\}', content, re.DOTALL)
-        if json_match:
+        # Try the first complete JSON object in the content
+        json_text = find_json_object(content)
+        if json_text:
             try:
-                return json.loads(json_match.group(0))
-            except json.JSONDecodeError:
-                pass
-
-        # Try to find a larger JSON object with nested content
-        json_match = re.search(r'\{.*"scope".*\}', content, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group(0))
-            except json.JSONDecodeError:
+                return orjson.loads(json_text)
+            except orjson.JSONDecodeError:
                 pass
 
         # If all parsing fails, return the content as scope (backward compatibility)
@@ -116,56 +147,74 @@ class ScopeGeneratorService:
         # Build additional context
         context_parts = []
         if category:
-            context_parts.append(f"فئة المشروع / Project Category: {category}")
+            context_parts.append(f"{SCOPE_CATEGORY_LABEL}{category}")
         if budget_range:
-            context_parts.append(f"نطاق الميزانية / Budget Range: {budget_range}")
+            context_parts.append(f"{SCOPE_BUDGET_RANGE_LABEL}{budget_range}")
 
         additional_context = "\n".join(context_parts) if context_parts else ""
 
         # Format the user prompt
-        user_prompt = SCOPE_GENERATION_USER.format(
+        user_prompt = SCOPE_GENERATION_USER_TEMPLATE.render(
             description=description,
             additional_context=additional_context
         )
 
-        # Generate with Claude
-        result = self.claude.generate(
-            prompt=user_prompt,
-            system_prompt=SCOPE_GENERATION_SYSTEM,
-            temperature=0.7
+        # Descriptions that differ only in case, diacritics or spacing share an entry
+        cache_key = AIResponseCache.get_key(
+            'scope',
+            SCOPE_GENERATION_SYSTEM,
+            SCOPE_GENERATION_USER_TEMPLATE.render(
+                description=canonicalize_prompt(description),
+                additional_context=additional_context
+            ),
         )
 
-        if result['success']:
-            # Parse the JSON response
-            parsed = self._parse_json_response(result['content'])
-
-            return {
-                'success': True,
-                'title': parsed.get('title'),
-                'description': parsed.get('description'),
-                'scope': parsed.get('scope', result['content']),
-                'budget_min': parsed.get('budget_min'),
-                'budget_max': parsed.get('budget_max'),
-                'estimated_duration_days': parsed.get('estimated_duration_days'),
-                'budget_reasoning': parsed.get('budget_reasoning'),
-                'tokens_used': result['tokens_used'],
-                'processing_time_ms': result['processing_time_ms'],
-                'error': None
-            }
-        else:
-            return {
-                'success': False,
-                'title': None,
-                'description': None,
-                'scope': None,
-                'budget_min': None,
-                'budget_max': None,
-                'estimated_duration_days': None,
-                'budget_reasoning': None,
-                'tokens_used': result['tokens_used'],
-                'processing_time_ms': result['processing_time_ms'],
-                'error': result['error']
-            }
+        def generate():
+            # Generate with Claude
+            result = self.claude.generate(
+                prompt=user_prompt,
+                system_prompt=SCOPE_GENERATION_SYSTEM,
+                temperature=0.7,
+                json_schema=SCOPE_RESPONSE_SCHEMA,
+                json_schema_name='submit_scope'
+            )
+
+            if result.success:
+                # Structured tool input, or parse the text response as a fallback
+                parsed = result.data
+                if not isinstance(parsed, dict):
+                    parsed = self._parse_json_response(result.content)
+
+                response = {
+                    'success': True,
+                    'title': parsed.get('title'),
+                    'description': parsed.get('description'),
+                    'scope': parsed.get('scope', result.content),
+                    'budget_min': parsed.get('budget_min'),
+                    'budget_max': parsed.get('budget_max'),
+                    'estimated_duration_days': parsed.get('estimated_duration_days'),
+                    'budget_reasoning': parsed.get('budget_reasoning'),
+                    'tokens_used': result.tokens_used,
+                    'processing_time_ms': result.processing_time_ms,
+                    'error': None
+                }
+                return response
+            else:
+                return {
+                    'success': False,
+                    'title': None,
+                    'description': None,
+                    'scope': None,
+                    'budget_min': None,
+                    'budget_max': None,
+                    'estimated_duration_days': None,
+                    'budget_reasoning': None,
+                    'tokens_used': result.tokens_used,
+                    'processing_time_ms': result.processing_time_ms,
+                    'error': result.error
+                }
+
+        return AIResponseCache.get_or_generate(cache_key, generate)
 
     def refine_scope(
         self,
@@ -194,37 +243,44 @@ class ScopeGeneratorService:
 
         focus_text = ""
         if improvement_focus:
-            focus_text = f"مجالات التركيز للتحسين / Focus Areas for Improvement:\n{improvement_focus}"
+            focus_text = f"{SCOPE_REFINE_FOCUS_LABEL}{improvement_focus}"
 
-        user_prompt = SCOPE_REFINE_USER.format(
+        user_prompt = SCOPE_REFINE_USER_TEMPLATE.render(
             current_scope=current_scope,
             improvement_focus=focus_text
         )
 
-        result = self.claude.generate(
-            prompt=user_prompt,
-            system_prompt=SCOPE_REFINE_SYSTEM,
-            temperature=0.6
-        )
-
-        if result['success']:
-            return {
-                'success': True,
-                'refined_scope': result['content'],
-                'suggestions': None,  # Could parse suggestions from content
-                'tokens_used': result['tokens_used'],
-                'processing_time_ms': result['processing_time_ms'],
-                'error': None
-            }
-        else:
-            return {
-                'success': False,
-                'refined_scope': None,
-                'suggestions': None,
-                'tokens_used': result['tokens_used'],
-                'processing_time_ms': result['processing_time_ms'],
-                'error': result['error']
-            }
+        cache_key = AIResponseCache.get_key('scope_refine', SCOPE_REFINE_SYSTEM, user_prompt)
+
+        def generate():
+            result = self.claude.generate(
+                prompt=user_prompt,
+                system_prompt=SCOPE_REFINE_SYSTEM,
+                temperature=0.6,
+                model_tier='fast'
+            )
+
+            if result.success:
+                response = {
+                    'success': True,
+                    'refined_scope': result.content,
+                    'suggestions': None,  # Could parse suggestions from content
+                    'tokens_used': result.tokens_used,
+                    'processing_time_ms': result.processing_time_ms,
+                    'error': None
+                }
+                return response
+            else:
+                return {
+                    'success': False,
+                    'refined_scope': None,
+                    'suggestions': None,
+                    'tokens_used': result.tokens_used,
+                    'processing_time_ms': result.processing_time_ms,
+                    'error': result.error
+                }
+
+        return AIResponseCache.get_or_generate(cache_key, generate)
 
     def generate_deliverables(
         self,
@@ -254,33 +310,39 @@ class ScopeGeneratorService:
 
         additional_text = ""
         if additional_requirements:
-            additional_text = f"متطلبات إضافية / Additional Requirements:\n{additional_requirements}"
+            additional_text = f"{DELIVERABLES_REQUIREMENTS_LABEL}{additional_requirements}"
 
-        user_prompt = DELIVERABLES_USER.format(
+        user_prompt = DELIVERABLES_USER_TEMPLATE.render(
             scope=scope,
             num_milestones=num_milestones,
             additional_requirements=additional_text
         )
 
-        result = self.claude.generate(
-            prompt=user_prompt,
-            system_prompt=DELIVERABLES_SYSTEM,
-            temperature=0.6
-        )
-
-        if result['success']:
-            return {
-                'success': True,
-                'deliverables': result['content'],
-                'tokens_used': result['tokens_used'],
-                'processing_time_ms': result['processing_time_ms'],
-                'error': None
-            }
-        else:
-            return {
-                'success': False,
-                'deliverables': None,
-                'tokens_used': result['tokens_used'],
-                'processing_time_ms': result['processing_time_ms'],
-                'error': result['error']
-            }
+        cache_key = AIResponseCache.get_key('deliverables', DELIVERABLES_SYSTEM, user_prompt)
+
+        def generate():
+            result = self.claude.generate(
+                prompt=user_prompt,
+                system_prompt=DELIVERABLES_SYSTEM,
+                temperature=0.6
+            )
+
+            if result.success:
+                response = {
+                    'success': True,
+                    'deliverables': result.content,
+                    'tokens_used': result.tokens_used,
+                    'processing_time_ms': result.processing_time_ms,
+                    'error': None
+                }
+                return response
+            else:
+                return {
+                    'success': False,
+                    'deliverables': None,
+                    'tokens_used': result.tokens_used,
+                    'processing_time_ms': result.processing_time_ms,
+                    'error': result.error
+                }
+
+        return AIResponseCache.get_or_generate(cache_key, generate)
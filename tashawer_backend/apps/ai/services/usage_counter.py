@@ -0,0 +1,113 @@
+"""
+Cached AI usage counters for limit checks.
+"""
+from datetime import timedelta
+from typing import Dict
+
+from django.core.cache import cache
+from django.utils import timezone
+
+
+class AIUsageCounter:
+    """
+    Per-user AI usage held in the cache for the current day and month, so
+    limit checks don't query AIUsageLimit on every request. Counters are
+    seeded from AIUsageLimit on a miss and expire with their window;
+    AIUsageLimit stays the durable record.
+    """
+
+    LIMITS_TIMEOUT = 3600  # seconds
+
+    @staticmethod
+    def get_window_keys(user_id, now):
+        return (
+            f'ai:usage:{user_id}:day:{now:%Y%m%d}',
+            f'ai:usage:{user_id}:month:{now:%Y%m}',
+        )
+
+    @staticmethod
+    def get_limits_key(user_id):
+        return f'ai:usage:{user_id}:limits'
+
+    @staticmethod
+    def _window_timeouts(now):
+        """Seconds until the end of the current UTC day and month."""
+        next_day = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        next_month = (now.replace(day=28) + timedelta(days=4)).replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        return (
+            max(1, int((next_day - now).total_seconds())),
+            max(1, int((next_month - now).total_seconds())),
+        )
+
+    @classmethod
+    def get_usage(cls, user) -> Dict[str, int]:
+        """Return daily/monthly used and limit counts for `user`."""
+        now = timezone.now()
+        day_key, month_key = cls.get_window_keys(user.pk, now)
+        limits_key = cls.get_limits_key(user.pk)
+
+        values = cache.get_many([day_key, month_key, limits_key])
+        if len(values) < 3:
+            values = cls._seed(user, now, day_key, month_key, limits_key)
+
+        daily_limit, monthly_limit = values[limits_key]
+        return {
+            'daily_used': values[day_key],
+            'daily_limit': daily_limit,
+            'monthly_used': values[month_key],
+            'monthly_limit': monthly_limit,
+        }
+
+    @classmethod
+    def _seed(cls, user, now, day_key, month_key, limits_key):
+        """Load the counters from AIUsageLimit (resetting stale windows) into the cache."""
+        from apps.ai.models import AIUsageLimit
+
+        limit, _ = AIUsageLimit.objects.get_or_create(user=user)
+
+        reset_fields = {}
+
+        # Reset daily counter if needed
+        if limit.daily_reset_at and limit.daily_reset_at.date() < now.date():
+            reset_fields.update(daily_used=0, daily_reset_at=now)
+
+        # Reset monthly counter if needed
+        reset_at = limit.monthly_reset_at
+        if reset_at and (reset_at.year, reset_at.month) < (now.year, now.month):
+            reset_fields.update(monthly_used=0, monthly_reset_at=now)
+
+        if reset_fields:
+            # One UPDATE of just the reset columns; save() would rewrite the
+            # totals that record_usage increments concurrently
+            AIUsageLimit.objects.filter(pk=limit.pk).update(**reset_fields)
+            for name, value in reset_fields.items():
+                setattr(limit, name, value)
+
+        day_timeout, month_timeout = cls._window_timeouts(now)
+        # add() keeps counters another request already seeded or incremented
+        cache.add(day_key, limit.daily_used, timeout=day_timeout)
+        cache.add(month_key, limit.monthly_used, timeout=month_timeout)
+        cache.set(limits_key, (limit.daily_limit, limit.monthly_limit), timeout=cls.LIMITS_TIMEOUT)
+
+        values = cache.get_many([day_key, month_key])
+        return {
+            day_key: values.get(day_key, limit.daily_used),
+            month_key: values.get(month_key, limit.monthly_used),
+            limits_key: (limit.daily_limit, limit.monthly_limit),
+        }
+
+    @classmethod
+    def increment(cls, user_id, count=1):
+        """Count `count` generations (negative to release) in the cached windows, if cached."""
+        for key in cls.get_window_keys(user_id, timezone.now()):
+            try:
+                cache.incr(key, count)
+            except ValueError:
+                pass  # Not cached; the next check seeds it from AIUsageLimit
+
+    @classmethod
+    def invalidate(cls, user_id):
+        """Drop the cached counters and limits for a user."""
+        cache.delete_many([*cls.get_window_keys(user_id, timezone.now()), cls.get_limits_key(user_id)])
@@ -0,0 +1,23 @@
+"""
+Signals for ai app.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.ai.models import AIUsageLimit
+from apps.ai.services.experience_cache import ConsultantExperienceCache
+from apps.ai.services.usage_counter import AIUsageCounter
+from apps.orders.models import Order, OrderStatus
+
+
+@receiver([post_save, post_delete], sender=Order)
+def completed_order_changed(sender, instance, **kwargs):
+    """Invalidate the consultant experience text when a completed order changes."""
+    if instance.status == OrderStatus.COMPLETED:
+        ConsultantExperienceCache.invalidate(instance.consultant_id)
+
+
+@receiver([post_save, post_delete], sender=AIUsageLimit)
+def usage_limit_changed(sender, instance, **kwargs):
+    """Drop the cached usage counters when limits or counts are edited."""
+    AIUsageCounter.invalidate(instance.user_id)
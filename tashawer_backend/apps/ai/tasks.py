@@ -0,0 +1,61 @@
+"""
+Celery tasks for ai app.
+"""
+import logging
+
+from celery import shared_task
+
+from apps.ai.models import AIGeneration
+from apps.ai.services import AIGenerationService, PDFGeneratorService, ProposalPDFJobs
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def run_ai_generation(generation_id, kwargs):
+    """
+    Run a queued AI generation outside the request cycle.
+    Completes the pending AIGeneration row and keeps the response
+    payload for the polling endpoint.
+    """
+    generation = AIGeneration.objects.select_related('user').get(pk=generation_id)
+    generation.status = AIGeneration.Status.PROCESSING
+    generation.save(update_fields=['status'])
+
+    try:
+        result = AIGenerationService.run(generation.generation_type, kwargs)
+    except Exception as e:
+        logger.error("AI generation %s failed: %s", generation_id, e)
+        result = {'success': False, 'error': str(e)}
+
+    AIGenerationService.record_usage(
+        user=generation.user,
+        generation_type=generation.generation_type,
+        input_text=generation.input_text,
+        result=result,
+        generation=generation,
+        reserved=True,
+    )
+
+    if result['success']:
+        AIGenerationService.set_result(
+            generation_id,
+            AIGenerationService.get_response_data(generation.generation_type, result),
+        )
+
+
+@shared_task
+def render_proposal_pdf(job_id, user_id, kwargs):
+    """
+    Render a proposal PDF outside the request cycle.
+    The PDF is kept in ProposalPDFJobs for the download endpoint.
+    """
+    service = PDFGeneratorService()
+    try:
+        buffer = service.build_proposal_pdf(**kwargs)
+    except Exception as e:
+        logger.error("Proposal PDF job %s failed: %s", job_id, e)
+        ProposalPDFJobs.fail(job_id, user_id, 'Failed to generate PDF')
+        raise
+
+    ProposalPDFJobs.complete(job_id, user_id, service.get_filename(), buffer.getvalue())
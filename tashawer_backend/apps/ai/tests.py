@@ -0,0 +1,351 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.ai.models import AIGeneration, AIUsageLimit
+from apps.ai.services import AIGenerationService, AIResponseCache
+from apps.ai.services.response_cache import canonicalize_prompt
+from apps.ai.services.scope_generator import find_json_object
+from apps.ai.services.usage_counter import AIUsageCounter
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def create_user(email='client@example.com'):
+    return User.objects.create_user(email, 'pass12345678', role='client')
+
+
+class AIGenerationTextTests(TestCase):
+    """input_text/output_text are stored zlib-compressed."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
+    def test_text_round_trip(self):
+        input_text = 'تصميم فيلا سكنية من طابقين ' * 50
+        output_text = '## Scope\n- Architectural design\n- Structural design\n' * 20
+        generation = AIGeneration.objects.create(
+            user=self.user,
+            generation_type=AIGeneration.GenerationType.SCOPE_GENERATE,
+            input_text=input_text,
+            output_text=output_text,
+        )
+
+        generation = AIGeneration.objects.get(pk=generation.pk)
+        self.assertEqual(generation.input_text, input_text)
+        self.assertEqual(generation.output_text, output_text)
+        self.assertEqual(generation.input_preview, input_text[:200])
+        self.assertLess(len(generation.input_blob), len(input_text.encode('utf-8')))
+
+    def test_missing_output_stays_none(self):
+        generation = AIGeneration.objects.create(
+            user=self.user,
+            generation_type=AIGeneration.GenerationType.PROPOSAL,
+            input_text='Project: Bridge',
+        )
+
+        generation = AIGeneration.objects.get(pk=generation.pk)
+        self.assertIsNone(generation.output_text)
+        self.assertIsNone(generation.output_blob)
+
+
+class FindJsonObjectTests(TestCase):
+
+    def test_object_surrounded_by_prose(self):
+        content = 'Here is the scope:\n{"title": "Villa", "budget_min": 1000}\nLet me know.'
+        self.assertEqual(find_json_object(content), '{"title": "Villa", "budget_min": 1000}')
+
+    def test_nested_objects(self):
+        content = 'x {"a": {"b": {"c": 1}}, "d": 2} y {"e": 3}'
+        self.assertEqual(find_json_object(content), '{"a": {"b": {"c": 1}}, "d": 2}')
+
+    def test_braces_and_escaped_quotes_inside_strings(self):
+        content = '{"scope": "use {braces} and \\"quotes\\" }", "n": 1} trailing }'
+        self.assertEqual(find_json_object(content), '{"scope": "use {braces} and \\"quotes\\" }", "n": 1}')
+
+    def test_no_object(self):
+        self.assertIsNone(find_json_object('no json here'))
+
+    def test_unbalanced_object(self):
+        self.assertIsNone(find_json_object('{"title": "Villa", "scope": {"a": 1}'))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AIResponseCacheKeyTests(TestCase):
+
+    def test_key_keeps_case_and_structure(self):
+        key = AIResponseCache.get_key('scope_refine', 'system', '- Item A\n- Item B')
+        self.assertNotEqual(key, AIResponseCache.get_key('scope_refine', 'system', '- item a - item b'))
+        self.assertNotEqual(key, AIResponseCache.get_key('scope_refine', 'system', '- ITEM A\n- ITEM B'))
+
+    def test_key_normalizes_unicode_form_and_outer_whitespace(self):
+        composed = AIResponseCache.get_key('scope_refine', 'system', 'caf\u00e9 ')
+        decomposed = AIResponseCache.get_key('scope_refine', 'system', 'cafe\u0301')
+        self.assertEqual(composed, decomposed)
+
+    def test_key_depends_on_namespace_and_system_prompt(self):
+        key = AIResponseCache.get_key('scope', 'system', 'prompt')
+        self.assertNotEqual(key, AIResponseCache.get_key('deliverables', 'system', 'prompt'))
+        self.assertNotEqual(key, AIResponseCache.get_key('scope', 'other system', 'prompt'))
+
+    def test_input_key_separates_values(self):
+        self.assertNotEqual(
+            AIResponseCache.get_input_key('proposal', 'ab', 'c'),
+            AIResponseCache.get_input_key('proposal', 'a', 'bc'),
+        )
+        self.assertEqual(
+            AIResponseCache.get_input_key('proposal', 'a', None),
+            AIResponseCache.get_input_key('proposal', 'a', ''),
+        )
+
+    def test_canonicalize_prompt_ignores_diacritics_tatweel_case_and_spacing(self):
+        self.assertEqual(canonicalize_prompt('بِنَـــاء  فيلا'), canonicalize_prompt('بناء فيلا'))
+        self.assertEqual(canonicalize_prompt(' Café\nDesign '), canonicalize_prompt('cafe design'))
+        self.assertNotEqual(canonicalize_prompt('بناء فيلا'), canonicalize_prompt('بناء مسجد'))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AIResponseCacheGenerateTests(TestCase):
+    """get_or_generate() caching and in-flight lock."""
+
+    KEY = 'ai:test:key'
+    SUCCESS = {'success': True, 'scope': 'Scope', 'tokens_used': 120, 'processing_time_ms': 900}
+    FAILURE = {'success': False, 'error': 'Claude API error', 'tokens_used': 0}
+
+    def setUp(self):
+        cache.clear()
+
+    def test_success_is_cached_and_served_as_free_hit(self):
+        generate = mock.Mock(return_value=self.SUCCESS)
+
+        self.assertEqual(AIResponseCache.get_or_generate(self.KEY, generate), self.SUCCESS)
+        cached = AIResponseCache.get_or_generate(self.KEY, generate)
+
+        generate.assert_called_once()
+        self.assertTrue(cached['cache_hit'])
+        self.assertEqual(cached['tokens_used'], 0)
+        self.assertEqual(cached['processing_time_ms'], 0)
+        self.assertEqual(cached['scope'], 'Scope')
+        self.assertIsNone(cache.get(f'{self.KEY}:lock'))
+
+    def test_failure_is_not_cached(self):
+        generate = mock.Mock(return_value=self.FAILURE)
+
+        AIResponseCache.get_or_generate(self.KEY, generate)
+        AIResponseCache.get_or_generate(self.KEY, generate)
+
+        self.assertEqual(generate.call_count, 2)
+
+    def test_lock_released_when_generation_raises(self):
+        with self.assertRaises(RuntimeError):
+            AIResponseCache.get_or_generate(self.KEY, mock.Mock(side_effect=RuntimeError))
+
+        self.assertIsNone(cache.get(f'{self.KEY}:lock'))
+
+    def test_waiter_gets_in_flight_result(self):
+        cache.add(f'{self.KEY}:lock', True)
+        generate = mock.Mock(return_value=self.SUCCESS)
+
+        def finish_in_flight(seconds):
+            AIResponseCache.set(self.KEY, self.SUCCESS)
+            cache.delete(f'{self.KEY}:lock')
+
+        with mock.patch('apps.ai.services.response_cache.time.sleep', side_effect=finish_in_flight):
+            result = AIResponseCache.get_or_generate(self.KEY, generate)
+
+        generate.assert_not_called()
+        self.assertTrue(result['cache_hit'])
+
+    def test_waiter_retries_under_lock_when_in_flight_fails(self):
+        lock_key = f'{self.KEY}:lock'
+        cache.add(lock_key, True)
+        locked_during_generate = []
+
+        def generate():
+            locked_during_generate.append(cache.get(lock_key) is not None)
+            return self.SUCCESS
+
+        with mock.patch(
+            'apps.ai.services.response_cache.time.sleep',
+            side_effect=lambda seconds: cache.delete(lock_key),
+        ):
+            AIResponseCache.get_or_generate(self.KEY, generate)
+
+        self.assertEqual(locked_during_generate, [True])
+        self.assertIsNone(cache.get(lock_key))
+
+    def test_wait_is_bounded(self):
+        cache.add(f'{self.KEY}:lock', True)
+        generate = mock.Mock(return_value=self.SUCCESS)
+
+        with mock.patch.object(AIResponseCache, 'WAIT_TIMEOUT', 0), \
+                mock.patch('apps.ai.services.response_cache.time.sleep') as sleep:
+            result = AIResponseCache.get_or_generate(self.KEY, generate)
+
+        sleep.assert_not_called()
+        generate.assert_called_once()
+        self.assertEqual(result, self.SUCCESS)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AIUsageCounterTests(TestCase):
+
+    NOW = datetime(2026, 3, 15, 12, 0, tzinfo=dt_timezone.utc)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
+    def setUp(self):
+        cache.clear()
+
+    def get_usage(self, now=NOW):
+        with mock.patch.object(timezone, 'now', return_value=now):
+            return AIUsageCounter.get_usage(self.user)
+
+    def test_seed_resets_stale_day(self):
+        AIUsageLimit.objects.create(
+            user=self.user, daily_used=5, monthly_used=20,
+            daily_reset_at=self.NOW - timedelta(days=1),
+            monthly_reset_at=self.NOW.replace(day=1),
+        )
+
+        usage = self.get_usage()
+
+        self.assertEqual(usage['daily_used'], 0)
+        self.assertEqual(usage['monthly_used'], 20)
+        limit = AIUsageLimit.objects.get(user=self.user)
+        self.assertEqual((limit.daily_used, limit.monthly_used), (0, 20))
+        self.assertEqual(limit.daily_reset_at, self.NOW)
+
+    def test_seed_resets_stale_month(self):
+        AIUsageLimit.objects.create(
+            user=self.user, daily_used=5, monthly_used=20,
+            daily_reset_at=self.NOW - timedelta(days=20),
+            monthly_reset_at=self.NOW - timedelta(days=20),
+        )
+
+        usage = self.get_usage()
+
+        self.assertEqual((usage['daily_used'], usage['monthly_used']), (0, 0))
+        limit = AIUsageLimit.objects.get(user=self.user)
+        self.assertEqual((limit.daily_used, limit.monthly_used), (0, 0))
+
+    def test_current_window_is_kept(self):
+        AIUsageLimit.objects.create(
+            user=self.user, daily_used=3, monthly_used=7,
+            daily_reset_at=self.NOW - timedelta(hours=2),
+            monthly_reset_at=self.NOW - timedelta(days=2),
+        )
+
+        usage = self.get_usage()
+
+        self.assertEqual((usage['daily_used'], usage['monthly_used']), (3, 7))
+        self.assertEqual((usage['daily_limit'], usage['monthly_limit']), (10, 100))
+
+    def test_cached_counters_are_incremented_without_queries(self):
+        self.get_usage()
+        with mock.patch.object(timezone, 'now', return_value=self.NOW):
+            AIUsageCounter.increment(self.user.pk, 2)
+
+        with self.assertNumQueries(0):
+            usage = self.get_usage()
+        self.assertEqual((usage['daily_used'], usage['monthly_used']), (2, 2))
+
+    def test_next_day_starts_a_new_window(self):
+        AIUsageLimit.objects.create(
+            user=self.user, daily_used=4, monthly_used=4,
+            daily_reset_at=self.NOW, monthly_reset_at=self.NOW,
+        )
+        self.assertEqual(self.get_usage()['daily_used'], 4)
+
+        usage = self.get_usage(self.NOW + timedelta(days=1))
+
+        self.assertEqual((usage['daily_used'], usage['monthly_used']), (0, 4))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AIGenerationServiceUsageTests(TestCase):
+    """Charging generations to AIUsageLimit, with reservation for queued ones."""
+
+    GENERATION_TYPE = AIGeneration.GenerationType.SCOPE_GENERATE
+    SUCCESS = {'success': True, 'scope': 'Scope', 'tokens_used': 120, 'processing_time_ms': 900}
+    FAILURE = {'success': False, 'error': 'Claude API error'}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
+    def setUp(self):
+        cache.clear()
+        AIUsageCounter.get_usage(self.user)
+
+    def assertUsage(self, used, generations, tokens):
+        limit = AIUsageLimit.objects.get(user=self.user)
+        self.assertEqual((limit.daily_used, limit.monthly_used), (used, used))
+        self.assertEqual(limit.total_generations, generations)
+        self.assertEqual(limit.total_tokens_used, tokens)
+        usage = AIUsageCounter.get_usage(self.user)
+        self.assertEqual((usage['daily_used'], usage['monthly_used']), (used, used))
+
+    def queue_generation(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            AIGenerationService.reserve_usage(self.user)
+        return AIGeneration.objects.create(
+            user=self.user, generation_type=self.GENERATION_TYPE, input_text='Villa',
+        )
+
+    def record(self, result, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return AIGenerationService.record_usage(
+                user=self.user,
+                generation_type=self.GENERATION_TYPE,
+                input_text='Villa',
+                result=result,
+                **kwargs,
+            )
+
+    def test_reserve_takes_one_generation(self):
+        self.queue_generation()
+
+        self.assertUsage(used=1, generations=0, tokens=0)
+
+    def test_reserved_success_keeps_the_reservation(self):
+        generation = self.queue_generation()
+
+        self.record(self.SUCCESS, generation=generation, reserved=True)
+
+        self.assertUsage(used=1, generations=1, tokens=120)
+        generation.refresh_from_db()
+        self.assertEqual(generation.status, AIGeneration.Status.COMPLETED)
+        self.assertEqual(generation.output_text, 'Scope')
+
+    def test_reserved_failure_releases_the_reservation(self):
+        generation = self.queue_generation()
+
+        self.record(self.FAILURE, generation=generation, reserved=True)
+
+        self.assertUsage(used=0, generations=0, tokens=0)
+        generation.refresh_from_db()
+        self.assertEqual(generation.status, AIGeneration.Status.FAILED)
+
+    def test_success_is_charged(self):
+        self.record(self.SUCCESS)
+
+        self.assertUsage(used=1, generations=1, tokens=120)
+        self.assertEqual(AIGeneration.objects.filter(user=self.user).count(), 1)
+
+    def test_failure_is_not_charged(self):
+        self.record(self.FAILURE)
+
+        self.assertUsage(used=0, generations=0, tokens=0)
+
+    def test_count_usage_charges_a_failure(self):
+        self.record(self.FAILURE, count_usage=True)
+
+        self.assertUsage(used=1, generations=1, tokens=0)
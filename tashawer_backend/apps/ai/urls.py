@@ -4,7 +4,11 @@ from .views import (
     ScopeRefineView,
     DeliverablesGenerateView,
     ProposalGenerateView,
+    ProposalGenerateStreamView,
+    ProposalGenerateBatchView,
     ProposalPDFView,
+    ProposalPDFJobView,
+    AIGenerationDetailView,
     AIUsageStatsView,
 )
 
@@ -18,7 +22,13 @@ urlpatterns = [
 
     # Proposal generation
     path('proposal/generate/', ProposalGenerateView.as_view(), name='proposal-generate'),
+    path('proposal/generate/stream/', ProposalGenerateStreamView.as_view(), name='proposal-generate-stream'),
+    path('proposal/generate/batch/', ProposalGenerateBatchView.as_view(), name='proposal-generate-batch'),
     path('proposal/pdf/', ProposalPDFView.as_view(), name='proposal-pdf'),
+    path('proposal/pdf/<uuid:job_id>/', ProposalPDFJobView.as_view(), name='proposal-pdf-job'),
+
+    # Queued generations
+    path('generations/<uuid:pk>/', AIGenerationDetailView.as_view(), name='generation-detail'),
 
     # Usage stats
     path('usage/', AIUsageStatsView.as_view(), name='usage-stats'),
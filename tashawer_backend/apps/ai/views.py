@@ -2,150 +2,153 @@
 API views for AI services.
 """
 
+import io
 import logging
-from django.utils import timezone
+import time
+from decimal import Decimal
+
+from django.db import transaction
+from django.http import FileResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.accounts.authentication import PROFILE_RELATIONS
+from apps.core.renderers import ORJSONRenderer
 from apps.projects.models import Project
 from apps.proposals.models import Proposal
 from .models import AIGeneration, AIUsageLimit
+from .tasks import render_proposal_pdf, run_ai_generation
 from .serializers import (
     ScopeGenerateSerializer,
     ScopeRefineSerializer,
     DeliverablesGenerateSerializer,
     ProposalGenerateSerializer,
+    ProposalGenerateBatchSerializer,
     ProposalPDFSerializer,
 )
 from .services import (
-    ScopeGeneratorService,
+    AIGenerationService,
+    AIInflightGauge,
+    AIUsageCounter,
     ProposalGeneratorService,
     PDFGeneratorService,
+    ProposalPDFJobs,
 )
 
 logger = logging.getLogger(__name__)
 
 
+def sse_event(event, data):
+    """Format a Server-Sent Events message."""
+    return f"event: {event}\ndata: {ORJSONRenderer().render(data).decode()}\n\n"
+
+
+def prefers_async(request):
+    """Whether the client asked for background processing (RFC 7240)."""
+    return 'respond-async' in request.headers.get('Prefer', '')
+
+
 class AIServiceMixin:
     """Mixin for common AI service functionality."""
 
-    def check_usage_limit(self, user):
-        """Check if user has reached their usage limit."""
-        limit, created = AIUsageLimit.objects.get_or_create(user=user)
-
-        # Reset daily counter if needed
-        now = timezone.now()
-        if limit.daily_reset_at and limit.daily_reset_at.date() < now.date():
-            limit.daily_used = 0
-            limit.daily_reset_at = now
-            limit.save()
+    # Shed new generations while the AI service is saturated
+    shed_under_load = True
 
-        # Reset monthly counter if needed
-        if limit.monthly_reset_at and limit.monthly_reset_at.month < now.month:
-            limit.monthly_used = 0
-            limit.monthly_reset_at = now
-            limit.save()
+    def check_usage_limit(self, user, count=1):
+        """Check if user can make `count` more generations."""
+        usage = AIUsageCounter.get_usage(user)
 
-        if limit.daily_used >= limit.daily_limit:
+        if usage['daily_used'] + count > usage['daily_limit']:
             return False, "Daily AI generation limit reached. Please try again tomorrow."
 
-        if limit.monthly_used >= limit.monthly_limit:
+        if usage['monthly_used'] + count > usage['monthly_limit']:
             return False, "Monthly AI generation limit reached."
 
         return True, None
 
-    def record_usage(self, user, generation_type, input_text, result, project=None, proposal=None):
+    def check_system_pressure(self, generation_type, count=1):
+        """Return a 503 Response if `count` more generations should be shed, else None."""
+        if not self.shed_under_load or not AIInflightGauge.is_overloaded(count):
+            return None
+
+        logger.warning(
+            "Shedding %s %s generation(s): %s in flight",
+            count, generation_type, AIInflightGauge.get(),
+        )
+        response = Response({
+            'success': False,
+            'message': 'AI service is busy. Please try again shortly.'
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        response['Retry-After'] = '30'
+        return response
+
+    def record_usage(self, user, generation_type, input_text, result, project=None, proposal=None,
+                     count_usage=None):
         """Record AI generation usage."""
-        generation = AIGeneration.objects.create(
+        return AIGenerationService.record_usage(
             user=user,
             generation_type=generation_type,
-            status=AIGeneration.Status.COMPLETED if result['success'] else AIGeneration.Status.FAILED,
-            input_text=input_text[:1000],  # Truncate for storage
-            output_text=result.get('scope') or result.get('proposal') or result.get('deliverables') or result.get('refined_scope'),
-            tokens_used=result.get('tokens_used', 0),
-            processing_time_ms=result.get('processing_time_ms', 0),
-            error_message=result.get('error'),
+            input_text=input_text,
+            result=result,
             project=project,
             proposal=proposal,
-            completed_at=timezone.now() if result['success'] else None,
+            count_usage=count_usage,
         )
 
-        # Update usage limits
-        if result['success']:
-            limit, _ = AIUsageLimit.objects.get_or_create(user=user)
-            limit.daily_used += 1
-            limit.monthly_used += 1
-            limit.total_generations += 1
-            limit.total_tokens_used += result.get('tokens_used', 0)
-            if not limit.daily_reset_at:
-                limit.daily_reset_at = timezone.now()
-            if not limit.monthly_reset_at:
-                limit.monthly_reset_at = timezone.now()
-            limit.save()
-
-        return generation
-
-
-class ScopeGenerateView(APIView, AIServiceMixin):
-    """
-    Generate project scope from a brief description.
-
-    POST /api/v1/ai/scope/generate/
-    """
-    permission_classes = [IsAuthenticated]
-
-    def post(self, request):
-        serializer = ScopeGenerateSerializer(data=request.data)
-
-        if not serializer.is_valid():
-            return Response({
-                'success': False,
-                'message': 'Validation error',
-                'errors': serializer.errors
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # Check usage limit
-        can_use, error_msg = self.check_usage_limit(request.user)
-        if not can_use:
+    def generate_response(self, request, generation_type, input_text, kwargs, project=None):
+        """
+        Run the generation and return its Response.
+        With `Prefer: respond-async` the generation is queued instead and
+        202 is returned with an id to poll at /api/v1/ai/generations/<id>/.
+        """
+        shed_response = self.check_system_pressure(generation_type)
+        if shed_response:
+            return shed_response
+
+        if prefers_async(request):
+            # Charge the quota now so queued generations count toward the limit
+            with transaction.atomic():
+                generation = AIGeneration.objects.create(
+                    user=request.user,
+                    generation_type=generation_type,
+                    input_text=input_text[:1000],  # Truncate for storage
+                    project=project,
+                )
+                AIGenerationService.reserve_usage(request.user)
+            # Celery's JSON serializer has no Decimal support
+            task_kwargs = {
+                key: str(value) if isinstance(value, Decimal) else value
+                for key, value in kwargs.items()
+            }
+            transaction.on_commit(
+                lambda: run_ai_generation.delay(str(generation.id), task_kwargs)
+            )
             return Response({
-                'success': False,
-                'message': error_msg
-            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+                'success': True,
+                'data': {
+                    'generation_id': str(generation.id),
+                    'status': generation.status,
+                }
+            }, status=status.HTTP_202_ACCEPTED)
 
-        # Generate scope
-        service = ScopeGeneratorService()
-        result = service.generate_scope(
-            description=serializer.validated_data['description'],
-            language=serializer.validated_data.get('language', 'ar'),
-            category=serializer.validated_data.get('category'),
-            budget_range=serializer.validated_data.get('budget_range'),
-        )
+        result = AIGenerationService.run(generation_type, kwargs)
 
-        # Record usage
         self.record_usage(
             user=request.user,
-            generation_type=AIGeneration.GenerationType.SCOPE_GENERATE,
-            input_text=serializer.validated_data['description'],
+            generation_type=generation_type,
+            input_text=input_text,
             result=result,
+            project=project,
         )
 
         if result['success']:
             return Response({
                 'success': True,
-                'data': {
-                    'title': result.get('title'),
-                    'description': result.get('description'),
-                    'scope': result['scope'],
-                    'budget_min': result.get('budget_min'),
-                    'budget_max': result.get('budget_max'),
-                    'estimated_duration_days': result.get('estimated_duration_days'),
-                    'budget_reasoning': result.get('budget_reasoning'),
-                    'tokens_used': result['tokens_used'],
-                    'processing_time_ms': result['processing_time_ms'],
-                }
+                'data': AIGenerationService.get_response_data(generation_type, result)
             }, status=status.HTTP_200_OK)
         else:
             return Response({
@@ -154,125 +157,147 @@ class ScopeGenerateView(APIView, AIServiceMixin):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class ScopeRefineView(APIView, AIServiceMixin):
+class AIGenerateView(APIView, AIServiceMixin):
     """
-    Refine an existing project scope.
-
-    POST /api/v1/ai/scope/refine/
+    POST: Validate with `serializer_class`, check the usage limit and run
+    a `generation_type` generation.
+    Serializer fields are passed to the service as kwargs and `input_field`
+    is recorded as the input; subclasses override the getters otherwise.
     """
     permission_classes = [IsAuthenticated]
+    serializer_class = None
+    generation_type = None
+    input_field = None
 
-    def post(self, request):
-        serializer = ScopeRefineSerializer(data=request.data)
+    def get_generation_kwargs(self, request, validated_data):
+        """Return (project, kwargs for the generator service) for the request."""
+        return None, dict(validated_data)
+
+    def get_input_text(self, kwargs):
+        """Return the input recorded on the AIGeneration."""
+        return kwargs[self.input_field]
+
+    def validate_request(self, request):
+        """Return (validated_data, None) or (None, error Response)."""
+        serializer = self.serializer_class(data=request.data)
 
         if not serializer.is_valid():
-            return Response({
+            return None, Response({
                 'success': False,
                 'message': 'Validation error',
                 'errors': serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
 
+        # Check usage limit
         can_use, error_msg = self.check_usage_limit(request.user)
         if not can_use:
-            return Response({
+            return None, Response({
                 'success': False,
                 'message': error_msg
             }, status=status.HTTP_429_TOO_MANY_REQUESTS)
 
-        service = ScopeGeneratorService()
-        result = service.refine_scope(
-            current_scope=serializer.validated_data['current_scope'],
-            improvement_focus=serializer.validated_data.get('improvement_focus'),
-        )
+        return serializer.validated_data, None
 
-        self.record_usage(
-            user=request.user,
-            generation_type=AIGeneration.GenerationType.SCOPE_REFINE,
-            input_text=serializer.validated_data['current_scope'],
-            result=result,
+    def post(self, request):
+        validated_data, error_response = self.validate_request(request)
+        if error_response:
+            return error_response
+
+        project, kwargs = self.get_generation_kwargs(request, validated_data)
+
+        return self.generate_response(
+            request,
+            generation_type=self.generation_type,
+            input_text=self.get_input_text(kwargs),
+            kwargs=kwargs,
+            project=project,
         )
 
-        if result['success']:
-            return Response({
-                'success': True,
-                'data': {
-                    'refined_scope': result['refined_scope'],
-                    'tokens_used': result['tokens_used'],
-                    'processing_time_ms': result['processing_time_ms'],
-                }
-            }, status=status.HTTP_200_OK)
-        else:
-            return Response({
-                'success': False,
-                'message': result['error']
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class ScopeGenerateView(AIGenerateView):
+    """
+    Generate project scope from a brief description.
 
-class DeliverablesGenerateView(APIView, AIServiceMixin):
+    POST /api/v1/ai/scope/generate/
+    """
+    serializer_class = ScopeGenerateSerializer
+    generation_type = AIGeneration.GenerationType.SCOPE_GENERATE
+    input_field = 'description'
+
+
+class ScopeRefineView(AIGenerateView):
+    """
+    Refine an existing project scope.
+
+    POST /api/v1/ai/scope/refine/
+    """
+    serializer_class = ScopeRefineSerializer
+    generation_type = AIGeneration.GenerationType.SCOPE_REFINE
+    input_field = 'current_scope'
+    # Refinement continues a scope the user is already working on
+    shed_under_load = False
+
+
+class DeliverablesGenerateView(AIGenerateView):
     """
     Generate deliverables from a project scope.
 
     POST /api/v1/ai/scope/deliverables/
     """
-    permission_classes = [IsAuthenticated]
+    serializer_class = DeliverablesGenerateSerializer
+    generation_type = AIGeneration.GenerationType.DELIVERABLES
+    input_field = 'scope'
 
-    def post(self, request):
-        serializer = DeliverablesGenerateSerializer(data=request.data)
 
-        if not serializer.is_valid():
-            return Response({
-                'success': False,
-                'message': 'Validation error',
-                'errors': serializer.errors
-            }, status=status.HTTP_400_BAD_REQUEST)
+class ProposalGenerateView(AIGenerateView):
+    """
+    Generate a professional proposal.
 
-        can_use, error_msg = self.check_usage_limit(request.user)
-        if not can_use:
-            return Response({
-                'success': False,
-                'message': error_msg
-            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+    POST /api/v1/ai/proposal/generate/
+    """
+    serializer_class = ProposalGenerateSerializer
+    generation_type = AIGeneration.GenerationType.PROPOSAL
 
-        service = ScopeGeneratorService()
-        result = service.generate_deliverables(
-            scope=serializer.validated_data['scope'],
-            num_milestones=serializer.validated_data.get('num_milestones', 4),
-            additional_requirements=serializer.validated_data.get('additional_requirements'),
-        )
+    def get_generation_kwargs(self, request, validated_data):
+        project = None
+        project_title = validated_data.get('project_title', '')
+        project_scope = validated_data.get('project_scope', '')
 
-        self.record_usage(
-            user=request.user,
-            generation_type=AIGeneration.GenerationType.DELIVERABLES,
-            input_text=serializer.validated_data['scope'],
-            result=result,
-        )
+        if validated_data.get('project_id'):
+            project = get_object_or_404(Project, pk=validated_data['project_id'])
+            project_title = project.title
+            project_scope = project.description or ''
 
-        if result['success']:
-            return Response({
-                'success': True,
-                'data': {
-                    'deliverables': result['deliverables'],
-                    'tokens_used': result['tokens_used'],
-                    'processing_time_ms': result['processing_time_ms'],
-                }
-            }, status=status.HTTP_200_OK)
-        else:
-            return Response({
-                'success': False,
-                'message': result['error']
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return project, {
+            'project_title': project_title,
+            'project_scope': project_scope,
+            'consultant_name': request.user.get_full_name(),
+            'consultant_bio': getattr(request.user, 'bio', None),
+            'proposed_amount': validated_data.get('proposed_amount'),
+            'currency': 'SAR',
+            'duration': validated_data.get('duration'),
+            'additional_notes': validated_data.get('additional_notes'),
+            'language': validated_data.get('language', 'ar'),
+        }
+
+    def get_input_text(self, kwargs):
+        return f"Project: {kwargs['project_title']}"
+
+    @staticmethod
+    def get_response_data(result):
+        return AIGenerationService.get_response_data(AIGeneration.GenerationType.PROPOSAL, result)
 
 
-class ProposalGenerateView(APIView, AIServiceMixin):
+class ProposalGenerateBatchView(ProposalGenerateView):
     """
-    Generate a professional proposal.
+    Generate several proposals in one request; they are sent to the AI
+    service concurrently.
 
-    POST /api/v1/ai/proposal/generate/
+    POST /api/v1/ai/proposal/generate/batch/
     """
-    permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        serializer = ProposalGenerateSerializer(data=request.data)
+        serializer = ProposalGenerateBatchSerializer(data=request.data)
 
         if not serializer.is_valid():
             return Response({
@@ -281,61 +306,108 @@ class ProposalGenerateView(APIView, AIServiceMixin):
                 'errors': serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        can_use, error_msg = self.check_usage_limit(request.user)
+        items = serializer.validated_data['proposals']
+        can_use, error_msg = self.check_usage_limit(request.user, count=len(items))
         if not can_use:
             return Response({
                 'success': False,
                 'message': error_msg
             }, status=status.HTTP_429_TOO_MANY_REQUESTS)
 
-        # Get project details
-        project = None
-        project_title = serializer.validated_data.get('project_title', '')
-        project_scope = serializer.validated_data.get('project_scope', '')
+        shed_response = self.check_system_pressure(AIGeneration.GenerationType.PROPOSAL, count=len(items))
+        if shed_response:
+            return shed_response
 
-        if serializer.validated_data.get('project_id'):
-            project = get_object_or_404(Project, pk=serializer.validated_data['project_id'])
-            project_title = project.title
-            project_scope = project.description or ''
+        prepared = [self.get_generation_kwargs(request, item) for item in items]
+        with AIInflightGauge.track(count=len(items)):
+            results = ProposalGeneratorService().generate_many([kwargs for _, kwargs in prepared])
 
-        service = ProposalGeneratorService()
-        result = service.generate_proposal(
-            project_title=project_title,
-            project_scope=project_scope,
-            consultant_name=request.user.get_full_name(),
-            consultant_bio=getattr(request.user, 'bio', None),
-            proposed_amount=serializer.validated_data.get('proposed_amount'),
-            currency='SAR',
-            duration=serializer.validated_data.get('duration'),
-            additional_notes=serializer.validated_data.get('additional_notes'),
-            language=serializer.validated_data.get('language', 'ar'),
-        )
+        data = []
+        for (project, kwargs), result in zip(prepared, results):
+            self.record_usage(
+                user=request.user,
+                generation_type=AIGeneration.GenerationType.PROPOSAL,
+                input_text=self.get_input_text(kwargs),
+                result=result,
+                project=project,
+            )
+            if result['success']:
+                data.append({'success': True, **self.get_response_data(result)})
+            else:
+                data.append({'success': False, 'message': result['error']})
 
-        self.record_usage(
-            user=request.user,
-            generation_type=AIGeneration.GenerationType.PROPOSAL,
-            input_text=f"Project: {project_title}",
-            result=result,
-            project=project,
-        )
+        return Response({
+            'success': any(item['success'] for item in data),
+            'data': data
+        }, status=status.HTTP_200_OK)
 
-        if result['success']:
-            return Response({
-                'success': True,
-                'data': {
-                    'proposal': result['proposal'],
-                    'estimated_duration_days': result.get('estimated_duration_days'),
-                    'estimated_amount': result.get('estimated_amount'),
-                    'estimation_reasoning': result.get('estimation_reasoning'),
-                    'tokens_used': result['tokens_used'],
-                    'processing_time_ms': result['processing_time_ms'],
-                }
-            }, status=status.HTTP_200_OK)
-        else:
-            return Response({
-                'success': False,
-                'message': result['error']
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class ProposalGenerateStreamView(ProposalGenerateView):
+    """
+    Generate a professional proposal, streamed as Server-Sent Events.
+    Emits `delta` events with raw response text as it arrives, then a
+    single `done` (same data as the non-streaming endpoint) or `error` event.
+
+    POST /api/v1/ai/proposal/generate/stream/
+    """
+
+    def post(self, request):
+        validated_data, error_response = self.validate_request(request)
+        if error_response:
+            return error_response
+
+        shed_response = self.check_system_pressure(AIGeneration.GenerationType.PROPOSAL)
+        if shed_response:
+            return shed_response
+
+        project, kwargs = self.get_generation_kwargs(request, validated_data)
+        user = request.user
+
+        def event_stream():
+            start_time = time.time()
+            stream = ProposalGeneratorService().generate_proposal_stream(**kwargs)
+            result = None
+            try:
+                with AIInflightGauge.track():
+                    while True:
+                        try:
+                            text = next(stream)
+                        except StopIteration as stop:
+                            result = stop.value
+                            break
+                        yield sse_event('delta', {'text': text})
+            finally:
+                # Runs even when the client disconnects and the server closes
+                # this generator mid-stream: the tokens were already spent
+                count_usage = None
+                if result is None:
+                    stream.close()  # Abort the model request
+                    result = {
+                        'success': False,
+                        'error': 'Stream closed before the proposal was complete',
+                        'tokens_used': 0,
+                        'processing_time_ms': int((time.time() - start_time) * 1000),
+                    }
+                    count_usage = True
+
+                self.record_usage(
+                    user=user,
+                    generation_type=AIGeneration.GenerationType.PROPOSAL,
+                    input_text=self.get_input_text(kwargs),
+                    result=result,
+                    project=project,
+                    count_usage=count_usage,
+                )
+
+            if result['success']:
+                yield sse_event('done', self.get_response_data(result))
+            else:
+                yield sse_event('error', {'message': result['error']})
+
+        response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # Disable proxy buffering (nginx)
+        return response
 
 
 class ProposalPDFView(APIView):
@@ -371,10 +443,17 @@ class ProposalPDFView(APIView):
 
         # If proposal_id provided, get content from database
         if serializer.validated_data.get('proposal_id'):
-            proposal = get_object_or_404(Proposal, pk=serializer.validated_data['proposal_id'])
+            # Join the project and the consultant's profile (for get_full_name)
+            proposal = get_object_or_404(
+                Proposal.objects.select_related(
+                    'project',
+                    *(f'consultant__{relation}' for relation in PROFILE_RELATIONS),
+                ),
+                pk=serializer.validated_data['proposal_id'],
+            )
 
             # Check if user has access to this proposal
-            if proposal.consultant != request.user and proposal.project.client != request.user:
+            if proposal.consultant_id != request.user.pk and proposal.project.client_id != request.user.pk:
                 return Response({
                     'success': False,
                     'message': 'You do not have access to this proposal'
@@ -385,7 +464,7 @@ class ProposalPDFView(APIView):
                 proposal=proposal,
                 generation_type=AIGeneration.GenerationType.PROPOSAL,
                 status=AIGeneration.Status.COMPLETED,
-            ).order_by('-created_at').first()
+            ).only('output_blob').order_by('-created_at').first()
 
             if ai_gen and ai_gen.output_text:
                 proposal_content = ai_gen.output_text
@@ -394,15 +473,100 @@ class ProposalPDFView(APIView):
             consultant_name = proposal.consultant.get_full_name() if proposal.consultant else 'Unknown'
             proposed_amount = str(proposal.proposed_amount) if proposal.proposed_amount else None
 
-        return service.generate_proposal_pdf(
-            proposal_content=proposal_content,
-            project_title=project_title,
-            consultant_name=consultant_name,
-            proposed_amount=proposed_amount,
-            currency='SAR',
-            is_rtl=True,
+        pdf_kwargs = {
+            'proposal_content': proposal_content,
+            'project_title': project_title,
+            'consultant_name': consultant_name,
+            'proposed_amount': proposed_amount,
+            'currency': 'SAR',
+            'is_rtl': True,
+        }
+
+        if prefers_async(request):
+            job_id = ProposalPDFJobs.create(request.user.pk)
+            render_proposal_pdf.delay(job_id, str(request.user.pk), pdf_kwargs)
+            return Response({
+                'success': True,
+                'data': {
+                    'job_id': job_id,
+                    'status': ProposalPDFJobs.Status.PENDING,
+                    'poll_url': reverse('ai:proposal-pdf-job', kwargs={'job_id': job_id}),
+                }
+            }, status=status.HTTP_202_ACCEPTED)
+
+        return service.generate_proposal_pdf(**pdf_kwargs)
+
+
+class ProposalPDFJobView(APIView):
+    """
+    Download a PDF queued with `Prefer: respond-async` on the PDF endpoint.
+    Returns 202 while it is still rendering.
+
+    GET /api/v1/ai/proposal/pdf/<job_id>/
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = ProposalPDFJobs.get(job_id, request.user.pk)
+        if job is None:
+            return Response({
+                'success': False,
+                'message': 'PDF job not found or expired'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        if job['status'] == ProposalPDFJobs.Status.PENDING:
+            return Response({
+                'success': True,
+                'data': {'job_id': str(job_id), 'status': job['status']}
+            }, status=status.HTTP_202_ACCEPTED)
+
+        if job['status'] == ProposalPDFJobs.Status.FAILED:
+            return Response({
+                'success': False,
+                'message': job['error']
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        return FileResponse(
+            io.BytesIO(job['content']),
+            content_type='application/pdf',
+            as_attachment=True,
+            filename=job['filename'],
+        )
+
+
+class AIGenerationDetailView(APIView):
+    """
+    Get the status (and result, once completed) of an AI generation.
+    Used to poll generations queued with `Prefer: respond-async`.
+
+    GET /api/v1/ai/generations/<id>/
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        generation = get_object_or_404(
+            AIGeneration.objects.only('id', 'generation_type', 'status', 'error_message', 'created_at', 'completed_at'),
+            pk=pk,
+            user=request.user,
         )
 
+        result = None
+        if generation.status == AIGeneration.Status.COMPLETED:
+            result = AIGenerationService.get_result(generation.pk)
+
+        return Response({
+            'success': True,
+            'data': {
+                'id': str(generation.id),
+                'type': generation.generation_type,
+                'status': generation.status,
+                'result': result,
+                'error': generation.error_message,
+                'created_at': generation.created_at,
+                'completed_at': generation.completed_at,
+            }
+        })
+
 
 class AIUsageStatsView(APIView):
     """
@@ -415,10 +579,13 @@ class AIUsageStatsView(APIView):
     def get(self, request):
         limit, _ = AIUsageLimit.objects.get_or_create(user=request.user)
 
-        # Get recent generations
+        # Get recent generations as plain rows (only the columns in the payload)
         recent_generations = AIGeneration.objects.filter(
             user=request.user
+        ).values(
+            'id', 'generation_type', 'status', 'tokens_used', 'created_at'
         ).order_by('-created_at')[:10]
+        type_labels = dict(AIGeneration.GenerationType.choices)
 
         return Response({
             'success': True,
@@ -437,11 +604,11 @@ class AIUsageStatsView(APIView):
                 },
                 'recent_generations': [
                     {
-                        'id': str(gen.id),
-                        'type': gen.get_generation_type_display(),
-                        'status': gen.status,
-                        'tokens_used': gen.tokens_used,
-                        'created_at': gen.created_at,
+                        'id': str(gen['id']),
+                        'type': type_labels.get(gen['generation_type'], gen['generation_type']),
+                        'status': gen['status'],
+                        'tokens_used': gen['tokens_used'],
+                        'created_at': gen['created_at'],
                     }
                     for gen in recent_generations
                 ]
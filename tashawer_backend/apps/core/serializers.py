@@ -0,0 +1,23 @@
+"""
+Shared serializer helpers.
+"""
+import copy
+
+
+class CachedFieldsMixin:
+    """
+    Cache a ModelSerializer's generated fields per class.
+
+    ModelSerializer.get_fields() introspects the model and builds every
+    field on each instantiation. This builds them once per serializer class
+    and hands each instance fresh (deep-copied, unbound) field objects, the
+    same way DRF copies declared fields.
+
+    Only use on serializers whose fields don't depend on context/instance.
+    """
+
+    def get_fields(self):
+        cls = type(self)
+        if '_cached_fields' not in cls.__dict__:
+            cls._cached_fields = super().get_fields()
+        return copy.deepcopy(cls._cached_fields)
@@ -147,9 +147,9 @@ class TestAIConnectionView(APIView):
 
     def post(self, request):
         """Test the Claude API connection."""
-        from apps.ai.services.claude import ClaudeService
+        from apps.ai.services.claude import get_claude_service
 
-        service = ClaudeService()
+        service = get_claude_service()
 
         if not service.is_available():
             return Response({
@@ -165,17 +165,17 @@ class TestAIConnectionView(APIView):
                 max_tokens=50,
             )
 
-            if result['success']:
+            if result.success:
                 return Response({
                     'success': True,
                     'message': 'Successfully connected to Claude AI',
                     'connected': True,
-                    'test_response': result['content'][:100] if result['content'] else '',
+                    'test_response': result.content[:100] if result.content else '',
                 }, status=status.HTTP_200_OK)
             else:
                 return Response({
                     'success': False,
-                    'message': result.get('error', 'Failed to connect'),
+                    'message': result.error or 'Failed to connect',
                     'connected': False,
                 }, status=status.HTTP_200_OK)
 
@@ -27,6 +27,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 THIRD_PARTY_APPS = [
@@ -161,7 +162,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.ProfileJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -171,6 +172,15 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'apps.core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
@@ -256,6 +266,10 @@ CACHES = {
 FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:3000')
 
 
+# PDF generation: directory with Amiri-Regular.ttf and Amiri-Bold.ttf (Arabic text)
+PDF_FONT_DIR = config('PDF_FONT_DIR', default=str(BASE_DIR / 'fonts'))
+
+
 # Tashawer Platform Settings
 TASHAWER_SETTINGS = {
     # Registration number prefix by city
@@ -331,3 +345,6 @@ ANTHROPIC_API_KEY = config('ANTHROPIC_API_KEY', default='')
 # AI Usage Limits (per user)
 AI_DAILY_LIMIT = config('AI_DAILY_LIMIT', default=10, cast=int)
 AI_MONTHLY_LIMIT = config('AI_MONTHLY_LIMIT', default=100, cast=int)
+
+# AI load shedding (generations calling the model at once, across all workers)
+AI_MAX_INFLIGHT_GENERATIONS = config('AI_MAX_INFLIGHT_GENERATIONS', default=32, cast=int)
@@ -14,6 +14,9 @@ DATABASES = {
     }
 }
 
+# Covering (INCLUDE) indexes are PostgreSQL-only; SQLite builds them as plain indexes
+SILENCED_SYSTEM_CHECKS = ['models.W040']
+
 # Allow all hosts in development
 ALLOWED_HOSTS = ['*']
 
@@ -29,6 +32,9 @@ except ImportError:
 # Use console email backend in development
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
+# Run Celery tasks inline so development works without a worker
+CELERY_TASK_ALWAYS_EAGER = True
+
 # Logging
 LOGGING = {
     'version': 1,